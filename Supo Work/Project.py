@@ -1,16 +1,211 @@
+from array import array
+from datetime import date
+import functools
+import weakref
+
+import numpy as np
+
+
+def travel_times(speeds, distances):
+    '''Matrix of the time each vehicle takes to cover each distance:
+    entry [i, j] is distances[j] / speeds[i]'''
+    speeds = np.asarray(speeds, dtype=float)
+    distances = np.asarray(distances, dtype=float)
+    return distances[np.newaxis, :] / speeds[:, np.newaxis]
+
+def bike_ages(years, current_year=None):
+    '''Age of each vehicle from its year, in the current year by default'''
+    if current_year is None:
+        current_year = date.today().year
+    return current_year - np.asarray(years)
+
+
+class _Slot(weakref.ref):
+    '''Weak reference to a registered bike that knows the bike's slot in
+    its Fleet, so nothing has to be stored on the bike itself'''
+    __slots__ = ('slot',)
+
+
+class Fleet:
+    '''Registry of every bike created, with indexes on brand, color and
+    year. Bikes are held by weak reference, so the registry does not
+    keep them alive.
+
+    Each bike gets an integer slot, in creation order. The registry is
+    a list of weak references by slot, one column of indexed values per
+    field, and for every field a dict from each value to an array of
+    the slots that have it, which costs 8 bytes per bike per index.
+    Entries are not removed when a bike dies or is re-indexed: lookups
+    check each slot against the columns, and once stale entries
+    outnumber live bikes the registry is compacted.'''
+    FIELDS = ('brand', 'color', 'year')
+
+    def __init__(self):
+        self._refs = []  # slot -> _Slot, or None once its bike has died
+        self._values = {field: [] for field in Fleet.FIELDS}
+        self._indexes = {field: {} for field in Fleet.FIELDS}
+        self._live = 0
+        self._stale = 0  # index entries that no longer match their slot
+        # One bound method shared by every _Slot, rather than one each
+        self._callback = self._died
+
+    def register(self, bike):
+        '''Add bike, or re-index it if its brand, color or year changed'''
+        keys = tuple(getattr(bike, '_' + field, None) for field in Fleet.FIELDS)
+        ref = self._ref(bike)
+        new = ref is None
+        if new:
+            ref = _Slot(bike, self._callback)
+            ref.slot = len(self._refs)
+            self._refs.append(ref)
+            for field in Fleet.FIELDS:
+                self._values[field].append(None)
+            self._live += 1
+        slot = ref.slot
+        for field, key in zip(Fleet.FIELDS, keys):
+            column = self._values[field]
+            if not new and column[slot] == key:
+                continue
+            if column[slot] is not None:
+                self._stale += 1
+            column[slot] = key
+            if key is not None:
+                self._indexes[field].setdefault(key, array('q')).append(slot)
+        if self._stale > self._live:
+            self._compact()
+
+    def _ref(self, bike):
+        # bike's _Slot in this registry, if it has one
+        for ref in weakref.getweakrefs(bike):
+            if type(ref) is _Slot and self._holds(ref):
+                return ref
+        return None
+
+    def _holds(self, ref):
+        # Whether ref is still this registry's reference for its slot
+        return 0 <= ref.slot < len(self._refs) and self._refs[ref.slot] is ref
+
+    def _died(self, ref):
+        # When bikes die as cyclic garbage, all their references are
+        # cleared before any callback runs, so an earlier callback may
+        # already have compacted ref away
+        if not self._holds(ref):
+            return
+        self._refs[ref.slot] = None
+        self._live -= 1
+        for field in Fleet.FIELDS:
+            if self._values[field][ref.slot] is not None:
+                self._stale += 1
+            self._values[field][ref.slot] = None
+        if self._stale > self._live:
+            self._compact()
+
+    def _compact(self):
+        # Renumber the live bikes' slots from 0, keeping their order, and
+        # rebuild the columns and indexes without stale entries. Dead
+        # references dropped here may still have their callbacks to come,
+        # so they are left with slot -1, which _died ignores
+        refs = []
+        for ref in self._refs:
+            if ref is not None:
+                if ref() is not None:
+                    refs.append(ref)
+                else:
+                    ref.slot = -1
+        values = {field: [] for field in Fleet.FIELDS}
+        indexes = {field: {} for field in Fleet.FIELDS}
+        for slot, ref in enumerate(refs):
+            for field in Fleet.FIELDS:
+                key = self._values[field][ref.slot]
+                values[field].append(key)
+                if key is not None:
+                    indexes[field].setdefault(key, array('q')).append(slot)
+            ref.slot = slot
+        self._refs, self._values, self._indexes = refs, values, indexes
+        self._live, self._stale = len(refs), 0
+
+    def _bikes(self, slots, criteria):
+        # The live bikes in slots that match every (field, key) criterion
+        refs, values = self._refs, self._values
+        result = set()
+        for slot in slots:
+            ref = refs[slot]
+            bike = ref() if ref is not None else None
+            if bike is not None and all(values[field][slot] == key
+                                        for field, key in criteria):
+                result.add(bike)
+        return result
+
+    def __iter__(self):
+        return iter([bike for bike in (ref() for ref in self._refs if ref is not None)
+                     if bike is not None])
+
+    def __len__(self):
+        return self._live
+
+    def find(self, field, key):
+        '''Set of the bikes whose field ('brand', 'color' or 'year') is key'''
+        return self._bikes(self._indexes[field].get(key, ()), [(field, key)])
+
+    def filter(self, brand=None, color=None, year=None):
+        '''Bikes matching every criterion given: the slots of the smallest
+        matching index entry, checked against the other criteria'''
+        criteria = [(field, key) for field, key in
+                    zip(Fleet.FIELDS, (brand, color, year)) if key is not None]
+        if not criteria:
+            return set(self)
+        smallest = min((self._indexes[field].get(key, ()) for field, key in criteria),
+                       key=len)
+        return self._bikes(smallest, criteria)
+
+    def columns(self, bikes=None):
+        '''(bikes, speeds, years) for bikes (every bike in the fleet by
+        default): the bikes as a list, and their maximum speeds and years
+        as NumPy columns in the same order (NaN where a bike has none)'''
+        bikes = list(self if bikes is None else bikes)
+        speeds = np.fromiter((b.get_max_speed() for b in bikes), float, len(bikes))
+        years = np.fromiter((getattr(b, '_year', np.nan) for b in bikes), float, len(bikes))
+        return bikes, speeds, years
+
+    def travel_times(self, distances, bikes=None):
+        '''(bikes, times): times[i, j] is the time bikes[i] takes to cover
+        distances[j]'''
+        bikes, speeds, _ = self.columns(bikes)
+        return bikes, travel_times(speeds, distances)
+
+    def ages(self, bikes=None, current_year=None):
+        '''(bikes, ages) in the same way'''
+        bikes, _, years = self.columns(bikes)
+        return bikes, bike_ages(years, current_year)
+
+
 class Bike:
-    all_bikes = []
+    all_bikes = Fleet()
     
     def __init__(self,co,br,yr):
         self._color = co
         self._brand = br
         self._year = yr
-        self._current_year = 2023
-        Bike.all_bikes.append(self)
+        Bike.all_bikes.register(self)
+
+    def __init_subclass__(cls, **kwargs):
+        # Subclasses set their own attributes rather than calling
+        # Bike.__init__, so register their instances once __init__ is done
+        super().__init_subclass__(**kwargs)
+        init = cls.__dict__.get('__init__')
+        if init is not None:
+            @functools.wraps(init)
+            def registering_init(self, *args, **kwargs):
+                init(self, *args, **kwargs)
+                Bike.all_bikes.register(self)
+            cls.__init__ = registering_init
         
         
-    def get_bike_age(self):
-        return (self._current_year - self._year)
+    def get_bike_age(self, current_year=None):
+        return int(bike_ages(self._year, current_year))
+
+    def get_max_speed(self):
+        return float('nan')  # no speed of its own
 
   
 
@@ -24,13 +219,13 @@ class Engine(Bike):
 
 
 class Motorbike(Engine, Bike):
-    def __init__(self,fl,fe,yr,br,co):
+    def __init__(self,fl,fe,yr,br,co, eng_spd = 80):
         self._fuel_level = fl #How many miles are left in tank
         self._fuel_efficiency = fe   #Capacity of engine
         self._year = yr
         self._brand = br
         self._color = co
-        self._engine_speed= 80
+        self._engine_speed = eng_spd
 
     def get_max_speed(self):
         return self._engine_speed
@@ -39,7 +234,7 @@ class Motorbike(Engine, Bike):
         return self.get_max_speed
    
     def cal_travel_time(self,distance):
-        return (distance / 80)
+        return distance / self._engine_speed
 
 class Bicycle(Bike):
     def __init__(self,ps,co,br,yr,):
@@ -55,6 +250,9 @@ class Bicycle(Bike):
     def get_pedal_speed(self):
         return self.ped_speed
 
+    def get_max_speed(self):
+        return self.ped_speed
+
     def cal_travel_time(self,distance):
         return distance / self.ped_speed
         '''t = d/s'''
@@ -0,0 +1,31 @@
+# -*- coding: utf-8 -*-
+# __init__.py
+
+"""The algorithms from the ticks, as one importable package.
+
+Sorting: fsa (the fixed-size arrays everything sorts), bums (bottom-up
+mergesort with half-size scratch space) and its variants bums_inplace,
+bums_keys, bums_numpy, bums_parallel and bums_stats.
+
+Compression: huffman, and huffman_cache for reusing codes.
+
+Graphs: csr (compressed sparse row graphs) and csr_file (their binary
+files), bfs_engine and bfs_all (shortest paths by BFS), check_dag,
+incremental_dag, bf_cycle (Bellman-Ford), sssp, johnson, maxflow and
+maxflow_service.
+
+instrument holds the opt-in counters and timers they all report to,
+and worker_pool the process pools that hand their workers a graph
+once, when they start.
+
+Importing the package, or any of its modules, does no work beyond
+defining things: the demos only run when a module is run with
+python -m, and the optional dependencies (bitstring for huffman,
+NumPy for the to_numpy and bums_numpy paths) are only imported when
+they are first used. Nothing is imported here, so `import algorithms`
+costs nothing. Import what you need, e.g.
+
+    from algorithms.maxflow import compute_max_flow
+
+The command-line tools are in __main__ (python -m algorithms --help).
+"""
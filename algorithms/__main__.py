@@ -0,0 +1,147 @@
+# -*- coding: utf-8 -*-
+# __main__.py
+
+"""Command-line tools. Each reads its input from stdin and writes its
+result to stdout, so they can be used in pipelines:
+
+    python -m algorithms compress   < FILE > FILE.huff
+    python -m algorithms decompress < FILE.huff > FILE
+    python -m algorithms sort [-n] [-r] < LINES
+    python -m algorithms maxflow S T [--flows] < NETWORK.csv
+
+compress streams its input through in blocks (--block-size bytes,
+64 KiB by default), each Huffman-coded with its own code, so memory
+use does not grow with the input. The output is MAGIC, then for every
+block a header with the block's size, the size of its encoding and
+the 256 occurrence counts the code was built from (the decoder builds
+the same code from them), then the encoding itself.
+
+sort sorts lines with bums (via bums_keys.KeySorter, so it is stable),
+as text or, with -n, by numeric value. It has to read all of its
+input before writing anything.
+
+maxflow reads a network in the edge-list CSV format of the
+flownetwork_*.csv files (header, then u,v,capacity rows) and writes
+the value of a maximum flow from S to T, followed, with --flows, by
+the flow on every edge as u,v,flow CSV rows.
+"""
+
+import argparse
+import os
+import struct
+import sys
+
+MAGIC = b'HUF1'
+BLOCK_SIZE = 1 << 16
+_BLOCK = struct.Struct('<II256I')
+
+
+def compress(src, dst, blockSize=BLOCK_SIZE):
+    """Huffman-code the bytes read from the binary file src into dst,
+    one block of up to blockSize bytes at a time."""
+    from .huffman import HuffmanCode
+    dst.write(MAGIC)
+    while block := src.read(blockSize):
+        occurrences = HuffmanCode.makeOccurrencesTable(block)
+        counts = list(occurrences.values())
+        code = HuffmanCode(HuffmanCode.occurrences2frequencies(occurrences))
+        encoded = code.encode(block).tobytes()
+        dst.write(_BLOCK.pack(len(block), len(encoded), *counts))
+        dst.write(encoded)
+
+
+def decompress(src, dst):
+    """Decode what compress wrote from the binary file src into dst.
+    Raise ValueError if src was not written by compress or is
+    truncated."""
+    import bitstring
+    from .huffman import HuffmanCode
+    if src.read(len(MAGIC)) != MAGIC:
+        raise ValueError("not a compressed stream")
+    while header := src.read(_BLOCK.size):
+        if len(header) < _BLOCK.size:
+            raise ValueError("truncated block header")
+        size, encodedSize, *counts = _BLOCK.unpack(header)
+        encoded = src.read(encodedSize)
+        if len(encoded) < encodedSize:
+            raise ValueError("truncated block")
+        occurrences = {i.to_bytes(1, 'big'): n for i, n in enumerate(counts)}
+        code = HuffmanCode(HuffmanCode.occurrences2frequencies(occurrences))
+        decoded = code.decode(bitstring.Bits(encoded))
+        if len(decoded) != size:
+            raise ValueError("corrupt block")
+        dst.write(decoded)
+
+
+def sortLines(src, dst, numeric=False, reverse=False):
+    """Write the lines of the text file src to dst in sorted order."""
+    from . import fsa
+    from .bums_keys import KeySorter
+    lines = [line.rstrip('\n') for line in src]
+    a = fsa.FixedSizeArray(len(lines))
+    for i, line in enumerate(lines):
+        a[i] = line
+    KeySorter(a, key=float if numeric else None, reverse=reverse).sort()
+    for i in range(len(a)):
+        dst.write(a[i] + '\n')
+
+
+def maxFlow(src, dst, s, t, flows=False):
+    """Write the value of a maximum flow from s to t in the network read
+    from the CSV text file src to dst, and the flow on every edge if
+    flows is True."""
+    import csv
+    from . import csr_file
+    from .maxflow import compute_max_flow
+    g = csr_file.read_csv(src)
+    flow, edgeFlows, _ = compute_max_flow(g, s, t)
+    dst.write(f"{flow}\n")
+    if flows:
+        rows = csv.writer(dst, lineterminator='\n')
+        rows.writerow(['u', 'v', 'flow'])
+        rows.writerows((u, v, f) for (u, v), f in edgeFlows.items())
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog='python -m algorithms', description=__doc__.split('\n\n')[0])
+    commands = parser.add_subparsers(dest='command', required=True)
+    p = commands.add_parser('compress', help='Huffman-compress stdin')
+    p.add_argument('--block-size', type=int, default=BLOCK_SIZE,
+                   help='bytes coded with each code (default: %(default)s)')
+    commands.add_parser('decompress', help='decompress what compress wrote')
+    p = commands.add_parser('sort', help='sort the lines of stdin')
+    p.add_argument('-n', '--numeric', action='store_true',
+                   help='compare lines as numbers')
+    p.add_argument('-r', '--reverse', action='store_true',
+                   help='sort in descending order')
+    p = commands.add_parser('maxflow', help='max flow in a CSV network')
+    p.add_argument('s', help='source vertex')
+    p.add_argument('t', help='sink vertex')
+    p.add_argument('--flows', action='store_true',
+                   help='also write the flow on every edge')
+    args = parser.parse_args(argv)
+
+    try:
+        if args.command == 'compress':
+            if args.block_size < 1:
+                parser.error("--block-size must be positive")
+            compress(sys.stdin.buffer, sys.stdout.buffer, args.block_size)
+        elif args.command == 'decompress':
+            decompress(sys.stdin.buffer, sys.stdout.buffer)
+        elif args.command == 'sort':
+            sortLines(sys.stdin, sys.stdout, args.numeric, args.reverse)
+        else:
+            maxFlow(sys.stdin, sys.stdout, args.s, args.t, args.flows)
+        sys.stdout.flush()
+    except ValueError as e:
+        sys.exit(f"{parser.prog} {args.command}: {e}")
+    except BrokenPipeError:
+        # Whatever was reading stdout (head, say) has gone; stop quietly,
+        # without Python failing again when it flushes stdout at exit
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
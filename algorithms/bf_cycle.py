@@ -0,0 +1,266 @@
+from array import array
+from collections import deque
+
+from . import instrument
+from .csr import CSRGraph
+
+
+def find_cycle(pred, v, n, none=None):
+    # Walk back n steps from v along the predecessor links, which lands
+    # inside a cycle if v was relaxed after the distances should have
+    # settled, then trace that cycle. Returns its vertices in edge
+    # order, or None if the walk runs out of predecessors first (none
+    # is the predecessor of the source).
+    for _ in range(n):
+        v = pred[v]
+        if v == none:
+            return None
+    cycle = [v]
+    u = pred[v]
+    while u != v:
+        cycle.append(u)
+        u = pred[u]
+    cycle.reverse()
+    return cycle
+
+def reach_from_negative_cycles(g, minweights):
+    # One extra pass over the edges: any edge that can still be relaxed
+    # after bf has given up leads out of a negative cycle (and every
+    # reachable negative cycle has such an edge), so everything
+    # reachable from their targets has no shortest path.
+    seeds = [v for u, edges in g.items() if minweights[u] != float('inf')
+             for v, c in edges.items() if minweights[u] + c < minweights[v]]
+    reached = set(seeds)
+    to_explore = deque(seeds)
+    while to_explore:
+        u = to_explore.popleft()
+        for v in g[u]:
+            if v not in reached:
+                reached.add(v)
+                to_explore.append(v)
+    return reached
+
+@instrument.timed('bf')
+def bf(g, s, unbounded=False):
+    # Bellman-Ford from s: g maps each vertex to a dict {neighbour: weight}.
+    # Returns (distances, None), or (None, cycle) if a negative cycle is
+    # reachable from s, cycle being the list of its vertices in edge
+    # order. With unbounded=True the second case returns
+    # (distances, cycle) instead, with a distance of -inf for every
+    # vertex reachable from a negative cycle. Stops as soon as a whole
+    # round changes nothing. g may also be a CSRGraph, with distances
+    # and cycle still in terms of its labels.
+    if isinstance(g, CSRGraph):
+        return bf_csr(g, g.index[s], unbounded)
+    n = len(g)
+    minweights = {v: float('inf') for v in g}
+    minweights[s] = 0
+    pred = {s: None}
+    relaxations = 0
+
+    # Without negative cycles at most n-1 rounds change anything, so a
+    # change in round n means there is one
+    for _ in range(n):
+        changed = None
+        for u, edges in g.items():
+            du = minweights[u]
+            if du == float('inf'):
+                continue
+            for v, c in edges.items():
+                if du + c < minweights[v]:
+                    minweights[v] = du + c
+                    pred[v] = u
+                    changed = v
+                    relaxations += 1
+        if changed is None:
+            break
+    if instrument.enabled:
+        instrument.add('bf.relaxations', relaxations)
+    if changed is None:
+        return (minweights, None)
+
+    cycle = find_cycle(pred, changed, n)
+    if not unbounded:
+        return (None, cycle)
+    for v in reach_from_negative_cycles(g, minweights):
+        minweights[v] = float('-inf')
+    return (minweights, cycle)
+
+def bf_csr(g, s, unbounded=False):
+    # bf over the arrays of a CSRGraph, from the vertex numbered s
+    n = len(g)
+    offsets, targets, weights = g.offsets, g.targets, g.weights
+    minweights = [float('inf')] * n
+    minweights[s] = 0
+    pred = array('q', [-1]) * n
+    relaxations = 0
+
+    for _ in range(n):
+        changed = -1
+        for u in range(n):
+            du = minweights[u]
+            if du == float('inf'):
+                continue
+            for i in range(offsets[u], offsets[u + 1]):
+                v = targets[i]
+                if du + weights[i] < minweights[v]:
+                    minweights[v] = du + weights[i]
+                    pred[v] = u
+                    changed = v
+                    relaxations += 1
+        if changed < 0:
+            break
+    if instrument.enabled:
+        instrument.add('bf.relaxations', relaxations)
+    if changed < 0:
+        return (dict(zip(g.labels, minweights)), None)
+
+    cycle = find_cycle(pred, changed, n, -1)
+    if cycle is not None:
+        cycle = [g.labels[v] for v in cycle]
+    if not unbounded:
+        return (None, cycle)
+    # As in reach_from_negative_cycles
+    seeds = [targets[i] for u in range(n) if minweights[u] != float('inf')
+             for i in range(offsets[u], offsets[u + 1])
+             if minweights[u] + weights[i] < minweights[targets[i]]]
+    reached = set(seeds)
+    to_explore = deque(seeds)
+    while to_explore:
+        u = to_explore.popleft()
+        for v in g.successors(u):
+            if v not in reached:
+                reached.add(v)
+                to_explore.append(v)
+    for v in reached:
+        minweights[v] = float('-inf')
+    return (dict(zip(g.labels, minweights)), cycle)
+
+@instrument.timed('bf_numpy')
+def bf_numpy(g, s, unbounded=False):
+    # bf with every round done by NumPy on arrays of edges (src, dst,
+    # w), for the same input and result as bf. Each round relaxes its
+    # edges from the distances of the previous round, cand = dist[src] +
+    # w, scattered into dist with np.minimum.at; it still settles within
+    # n-1 rounds without negative cycles, so the checks are bf's. Only
+    # the edges out of vertices improved in the previous round can
+    # improve anything, so those are the only ones a round relaxes,
+    # gathered from the CSR offsets. Distances are computed as doubles,
+    # and returned as ints if every weight is an int (exact up to 2**53).
+    # A dict g is packed into a CSRGraph first, which takes longer than
+    # the search itself on big graphs: keep graphs you search often as
+    # CSRGraphs (or csr_file files).
+    import numpy as np
+    if not isinstance(g, CSRGraph):
+        g = CSRGraph.from_weighted(g)
+    n = len(g)
+    offsets = np.asarray(g.offsets, dtype=np.int64)
+    targets = np.asarray(g.targets, dtype=np.int64)
+    weights = np.asarray(g.weights)
+    integral = weights.dtype.kind in 'iu'
+    weights = weights.astype(np.float64)
+    source = g.index[s]
+    dist = np.full(n, np.inf)
+    dist[source] = 0.0
+    pred = np.full(n, -1, dtype=np.int64)
+    relaxations = 0
+
+    improved = np.array([source], dtype=np.int64)
+    marked = np.zeros(n, dtype=bool)
+    for _ in range(n):
+        # The edges out of the improved vertices, as src, dst and w arrays
+        starts = offsets[improved]
+        counts = offsets[improved + 1] - starts
+        edge = (np.repeat(starts - np.cumsum(counts) + counts, counts)
+                + np.arange(counts.sum()))
+        src = np.repeat(improved, counts)
+        dst = targets[edge]
+        cand = dist[src] + weights[edge]
+        better = np.flatnonzero(cand < dist[dst])
+        if not len(better):
+            break
+        relaxations += len(better)
+        src, dst, cand = src[better], dst[better], cand[better]
+        np.minimum.at(dist, dst, cand)
+        # The predecessor of each improved vertex is the source of an
+        # edge that gave it its new distance
+        won = cand == dist[dst]
+        pred[dst[won]] = src[won]
+        marked[dst] = True
+        improved = np.flatnonzero(marked)
+        marked[improved] = False
+    else:
+        improved = None
+    if instrument.enabled:
+        instrument.add('bf_numpy.relaxations', relaxations)
+
+    def result(dist):
+        if integral:
+            finite = np.isfinite(dist)
+            values = np.where(finite, dist, 0).astype(np.int64).tolist()
+            for v in np.flatnonzero(~finite).tolist():
+                values[v] = float(dist[v])
+        else:
+            values = dist.tolist()
+        if values[source] == 0:
+            # As in bf, where it starts as the int 0 whatever the weights
+            values[source] = 0
+        return dict(zip(g.labels, values))
+    if improved is not None:
+        return (result(dist), None)
+
+    cycle = find_cycle(pred, int(dst[0]), n, -1)
+    if cycle is not None:
+        cycle = [g.labels[v] for v in cycle]
+    if not unbounded:
+        return (None, cycle)
+    # As in reach_from_negative_cycles, over all the edges at once
+    src = np.repeat(np.arange(n, dtype=np.int64), np.diff(offsets))
+    reached = np.zeros(n, dtype=bool)
+    reached[targets[dist[src] + weights < dist[targets]]] = True
+    while True:
+        spread = reached[src] & ~reached[targets]
+        if not spread.any():
+            break
+        reached[targets[spread]] = True
+    dist[reached] = -np.inf
+    return (result(dist), cycle)
+
+def spfa(g, s):
+    # Queue-based Bellman-Ford (SPFA): same input and result as bf, but
+    # only the edges out of vertices whose distance has just changed are
+    # relaxed, in FIFO order.
+    n = len(g)
+    minweights = {v: float('inf') for v in g}
+    minweights[s] = 0
+    pred = {s: None}
+    # relaxations[v] counts the relaxations along the chain that gave v
+    # its current distance; a shortest path has at most n-1 edges, so a
+    # count of n means the chain has gone round a negative cycle
+    relaxations = {s: 0}
+    queued = {s}
+    to_explore = deque([s])
+
+    while to_explore:
+        u = to_explore.popleft()
+        queued.discard(u)
+        du = minweights[u]
+        for v, c in g[u].items():
+            if du + c < minweights[v]:
+                minweights[v] = du + c
+                pred[v] = u
+                relaxations[v] = relaxations[u] + 1
+                if relaxations[v] >= n:
+                    cycle = find_cycle(pred, v, n)
+                    if cycle:
+                        return (None, cycle)
+                if v not in queued:
+                    queued.add(v)
+                    to_explore.append(v)
+
+    return (minweights, None)
+
+if __name__ == '__main__':
+    graph = {'a':{'b':3, 'c': -2}, 'b':{}, 'c':{'a':-1}}
+
+    print(bf(graph, 'a'))
@@ -0,0 +1,190 @@
+from array import array
+from collections import OrderedDict
+
+from . import worker_pool
+from .bfs_engine import bfs, index_graph, predecessors
+
+
+def _search(offsets, targets, source):
+    # The arrays of a ShortestPathDAG: (dist, order, pred_offsets,
+    # pred_targets)
+    dist, _, order = bfs(offsets, targets, source)
+    return (dist, order) + predecessors(offsets, targets, dist, order)
+
+class ShortestPathDAG:
+    # One BFS from s over g (a dict mapping each vertex to a set of
+    # neighbours), keeping the distance and every shortest-path
+    # predecessor of every vertex, in flat integer arrays (see
+    # bfs_engine). Vertices are referred to by label in the public
+    # methods. indexed is g already packed by index_graph, and arrays
+    # the result of the search if it has already been done elsewhere.
+    def __init__(self, g, s, indexed=None, arrays=None):
+        self.labels, self.index, offsets, targets = indexed or index_graph(g)
+        self.source = self.index[s]
+        (self.dist, self.order, self.pred_offsets,
+         self.pred_targets) = arrays or _search(offsets, targets, self.source)
+        self._counts = None
+
+    def nbytes(self):
+        # Memory held by this DAG's arrays (the indexed graph is shared)
+        size = sum(a.itemsize * len(a) for a in
+                   (self.dist, self.order, self.pred_offsets, self.pred_targets))
+        if self._counts is not None:
+            size += 8 * len(self._counts)
+        return size
+
+    def preds(self, v):
+        # Predecessor ids of vertex id v
+        return self.pred_targets[self.pred_offsets[v]:self.pred_offsets[v + 1]]
+
+    def counts(self):
+        # Number of shortest paths from s to each vertex id, by dynamic
+        # programming over the BFS order (every predecessor of a vertex
+        # is found before it), in O(V+E)
+        if self._counts is None:
+            counts = [0] * len(self.labels)
+            counts[self.source] = 1
+            for v in self.order[1:]:
+                counts[v] = sum(counts[p] for p in self.preds(v))
+            self._counts = counts
+        return self._counts
+
+    def count_paths(self, t):
+        # Like shortest_paths, counts nothing when t is s or unreachable
+        v = self.index[t]
+        return self.counts()[v] if v != self.source else 0
+
+    def iter_paths(self, t, limit=None, offset=0):
+        # Yield the shortest paths from s to t one at a time, walking
+        # the predecessor DAG back from t with an explicit stack, so
+        # neither memory nor recursion depth grows with the number of
+        # paths. The first offset paths are skipped (whole branches at a
+        # time, using path counts) and at most limit paths are yielded.
+        target = self.index[t]
+        if target == self.source or self.dist[target] < 0 or limit == 0:
+            return
+        counts = self.counts() if offset else None
+        labels = self.labels
+
+        chain = [target]  # t back to the vertex whose preds are on top
+        stack = [iter(self.preds(target))]
+        yielded = 0
+        while stack:
+            pred = next(stack[-1], -1)
+            if pred < 0:
+                stack.pop()
+                chain.pop()
+            elif offset and counts[pred] <= offset:
+                offset -= counts[pred]
+            elif pred == self.source:
+                # offset is now 0
+                yield [labels[pred]] + [labels[v] for v in reversed(chain)]
+                yielded += 1
+                if yielded == limit:
+                    return
+            else:
+                chain.append(pred)
+                stack.append(iter(self.preds(pred)))
+
+class DAGCache:
+    # LRU cache of the ShortestPathDAGs of one graph g, keyed by source,
+    # holding at most max_bytes of arrays (see ShortestPathDAG.nbytes).
+    # g is indexed once, for all the searches.
+    def __init__(self, g, max_bytes=64 << 20):
+        self.g = g
+        self.indexed = index_graph(g)
+        self.max_bytes = max_bytes
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._dags = OrderedDict()
+
+    def __contains__(self, s):
+        return s in self._dags
+
+    def get(self, s):
+        if s in self._dags:
+            self.hits += 1
+            self._dags.move_to_end(s)
+            return self._dags[s][0]
+        self.misses += 1
+        dag = ShortestPathDAG(self.g, s, self.indexed)
+        self.put(s, dag)
+        return dag
+
+    def put(self, s, dag):
+        # Counts may be added to a DAG after it is cached, so sizes are
+        # taken when it goes in
+        size = dag.nbytes()
+        if size > self.max_bytes:
+            return
+        if s in self._dags:
+            self.nbytes -= self._dags.pop(s)[1]
+        self._dags[s] = (dag, size)
+        self.nbytes += size
+        while self.nbytes > self.max_bytes:
+            _, (_, evicted) = self._dags.popitem(last=False)
+            self.nbytes -= evicted
+
+def shortest_paths_batch(g, queries, cache=None, workers=1):
+    # Answer many (s, t) queries at once, returning the list of
+    # shortest_paths(g, s, t) for each, in query order. Queries are
+    # grouped by source, so there is one BFS per distinct source;
+    # searches are looked up in (and added to) cache, a DAGCache of g,
+    # if given, and the missing ones are spread over a pool of that
+    # many worker processes if workers > 1.
+    queries = list(queries)
+    by_source = OrderedDict()
+    for i, (s, t) in enumerate(queries):
+        by_source.setdefault(s, []).append(i)
+    if cache is None:
+        cache = DAGCache(g, max_bytes=0)
+
+    results = [None] * len(queries)
+    def answer(s, dag):
+        for i in by_source[s]:
+            results[i] = list(dag.iter_paths(queries[i][1]))
+
+    missing = [s for s in by_source if s not in cache]
+    if workers > 1 and len(missing) > 1:
+        labels, index, offsets, targets = cache.indexed
+        shared = (_picklable(offsets), _picklable(targets))
+        with worker_pool.pool(workers, shared) as pool:
+            searches = pool.map(_search_in_worker, [index[s] for s in missing])
+            for s, arrays in zip(missing, searches):
+                cache.misses += 1
+                dag = ShortestPathDAG(g, s, cache.indexed, arrays)
+                cache.put(s, dag)
+                answer(s, dag)
+    for s in by_source:
+        if results[by_source[s][0]] is None:
+            answer(s, cache.get(s))
+    return results
+
+def _picklable(a):
+    # a, or a copy of it as an array if it is a memoryview (the arrays
+    # of a graph from csr_file.load are), which cannot be pickled to a
+    # worker started with the spawn method
+    if isinstance(a, memoryview):
+        copy = array('q', [0]) * len(a)
+        memoryview(copy)[:] = a
+        return copy
+    return a
+
+def _search_in_worker(source):
+    return _search(*worker_pool.shared(), source)
+
+def count_shortest_paths(g, s, t):
+    # Number of shortest paths from s to t, without enumerating them
+    return ShortestPathDAG(g, s).count_paths(t)
+
+def iter_shortest_paths(g, s, t, limit=None, offset=0):
+    # Lazy version of shortest_paths, see ShortestPathDAG.iter_paths
+    return ShortestPathDAG(g, s).iter_paths(t, limit, offset)
+
+def shortest_paths(g, s, t):
+    return list(iter_shortest_paths(g, s, t))
+
+if __name__ == '__main__':
+    graph = {0: {3}, 1: {2, 3}, 2: set(), 3: {2}}
+    print(shortest_paths(graph, 3, 1))
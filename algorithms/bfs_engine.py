@@ -0,0 +1,97 @@
+from array import array
+
+from .csr import CSRGraph
+
+# Breadth-first search over graphs packed into integer arrays.
+#
+# Vertices are numbered 0..n-1, and the edges out of vertex u are
+# targets[offsets[u]:offsets[u+1]] (compressed sparse row form), so a
+# graph costs two flat arrays instead of a container per vertex. The
+# BFS results are flat arrays indexed the same way.
+
+
+def index_graph(g):
+    # Pack g, a dict mapping each vertex to an iterable of neighbours (a
+    # set or a dict, or None for no neighbours), into CSR arrays.
+    # Returns (labels, index, offsets, targets): labels[i] is the vertex
+    # numbered i and index maps it back. Vertices that only appear as
+    # neighbours get numbers (and no edges) too. A CSRGraph is already
+    # packed, and its arrays are returned as they are.
+    if isinstance(g, CSRGraph):
+        return g.labels, g.index, g.offsets, g.targets
+    labels = list(g)
+    index = {v: i for i, v in enumerate(labels)}
+    offsets = array('q', [0])
+    targets = array('q')
+    for v in g:
+        for w in g[v] or ():
+            if w not in index:
+                index[w] = len(labels)
+                labels.append(w)
+            targets.append(index[w])
+        offsets.append(len(targets))
+    offsets.extend([len(targets)] * (len(labels) + 1 - len(offsets)))
+    return labels, index, offsets, targets
+
+def bfs(offsets, targets, s, t=-1, via=False, residual=None):
+    # Level-synchronous BFS from s. Returns (dist, reached_by, order):
+    # dist[v] is the number of edges on a shortest path from s to v (-1
+    # if v is not reached), reached_by[v] is the edge v was first
+    # reached by, as an index into targets (-1 for s and unreached
+    # vertices; reached_by is None unless via is True) and order lists
+    # the reached vertices in the order they were found. If t >= 0 the
+    # search stops at the end of the level in which t is found. If
+    # residual is given it is indexed like targets, and only the edges
+    # j with residual[j] > 0 are followed (maxflow's residual graphs).
+    #
+    # order doubles as the queue: each level's frontier is the slice of
+    # order found during the previous level.
+    n = len(offsets) - 1
+    dist = array('q', [-1]) * n
+    reached_by = array('q', [-1]) * n if via else None
+    dist[s] = 0
+    order = array('q', [s])
+    start = 0
+    level = 0
+    while start < len(order):
+        end = len(order)
+        level += 1
+        for i in range(start, end):
+            u = order[i]
+            for j in range(offsets[u], offsets[u + 1]):
+                v = targets[j]
+                if dist[v] < 0 and (residual is None or residual[j] > 0):
+                    dist[v] = level
+                    if via:
+                        reached_by[v] = j
+                    order.append(v)
+        if t >= 0 and dist[t] >= 0:
+            break
+        start = end
+    return dist, reached_by, order
+
+def predecessors(offsets, targets, dist, order):
+    # Every shortest-path predecessor of every vertex, packed CSR-style:
+    # those of v are pred_targets[pred_offsets[v]:pred_offsets[v+1]], in
+    # the order they were reached. Returns (pred_offsets, pred_targets).
+    n = len(dist)
+    pred_offsets = array('q', [0]) * (n + 1)
+    for u in order:
+        next_level = dist[u] + 1
+        for j in range(offsets[u], offsets[u + 1]):
+            v = targets[j]
+            if dist[v] == next_level:
+                pred_offsets[v + 1] += 1
+    for v in range(n):
+        pred_offsets[v + 1] += pred_offsets[v]
+
+    free = pred_offsets[:-1]  # next free slot for each vertex
+    pred_targets = array('q', [0]) * pred_offsets[n]
+    for u in order:
+        next_level = dist[u] + 1
+        for j in range(offsets[u], offsets[u + 1]):
+            v = targets[j]
+            if dist[v] == next_level:
+                pred_targets[free[v]] = u
+                free[v] += 1
+    return pred_offsets, pred_targets
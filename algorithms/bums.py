@@ -21,7 +21,7 @@ larger than half the array (whereas the leftmost chunk can: 9 cells
 will split as 8+1 at the top level).
 """
 
-import fsa
+from . import fsa, instrument
 
 
 class Sorter:
@@ -61,6 +61,7 @@ class Sorter:
         """
         return 2**p
 
+    @instrument.timed('Sorter.sort')
     def sort(self):
         """Sort the values in self.d in ascending order, leaving them in
         self.d, using the bottom-up merge sort algorithm, without
@@ -75,48 +76,64 @@ class Sorter:
         POSTCONDITON self.d contains the same values as before, but
         sorted in ascending order.
         """
-        num_passes = self.passes()
-        l_arr = len(self.d)
-        for i in range(num_passes):
-            chunk = self.chunkSizeInPass(i)
-            # Check it's not the last pass
-            if i != num_passes-1:
-                for j in range(0, l_arr, chunk*2):
-                    # Check if only two chunks to sort
-                    if l_arr-j-chunk*2 < 0:
-                        if l_arr-j-chunk < 0:
-                            break
-                        else:
-                            # Copy chunk into scratch space
-                            Sorter.lddr(
-                                self.d, l_arr-j-chunk, l_arr-j,
-                                self.s, 0, chunk)
-                            # Merge chunks
-                            self.mergeRL(
-                                self.d, 0, l_arr-j-chunk,
-                                self.s, 0, chunk,
-                                self.d, 0, l_arr-j)
-                    else:
-                        # Copy chunk into scratch space
-                        Sorter.lddr(self.d, l_arr-j-chunk, l_arr-j,
-                                    self.s, 0, chunk)
-                        # Merge chunks
-                        self.mergeRL(self.d, l_arr-j-chunk*2, l_arr-j-chunk,
-                                     self.s, 0, chunk,
-                                     self.d, l_arr-j-chunk*2, l_arr-j)
-
-            # If it is the last pass
-            else:
-                # Copy chunk into scratch space
-                Sorter.lddr(self.d, 0, l_arr-chunk,
-                            self.s, 0, l_arr-chunk)
-                # Move array to the left
-                Sorter.lddr(self.d, l_arr-chunk, l_arr,
-                            self.d, 0, chunk)
-                # Merge chunks
-                self.mergeRL(self.d, 0, chunk,
-                             self.s, 0, l_arr-chunk,
-                             self.d, 0, l_arr)
+        for p in range(self.passes()):
+            self.mergePass(p)
+
+    def mergePass(self, p):
+        """Perform pass p of the bottom-up merge sort, merging every pair
+        of adjacent chunks of size chunkSizeInPass(p).
+
+        PRECONDITION: passes 0 to p-1 have already been performed.
+        """
+        for iStart, iMid, iEnd in self.chunkPairsInPass(p):
+            self.mergeChunks(iStart, iMid, iEnd)
+
+    def chunkPairsInPass(self, p):
+        """Yield, from right to left, an (iStart, iMid, iEnd) triple for
+        each pair of adjacent chunks self.d[iStart:iMid] and
+        self.d[iMid:iEnd] to be merged during pass p. Chunks are
+        aligned to the right end of the array, so only the leftmost
+        chunk may be shorter than chunkSizeInPass(p); a leftmost chunk
+        left without a partner is already sorted and is not yielded.
+
+        PRECONDITION: p is an integer between 0 included and
+        self.passes() excluded.
+        """
+        chunk = self.chunkSizeInPass(p)
+        for iEnd in range(len(self.d), chunk, -2*chunk):
+            yield max(0, iEnd-2*chunk), iEnd-chunk, iEnd
+
+    def mergeChunks(self, iStart, iMid, iEnd):
+        """Merge the sorted chunks self.d[iStart:iMid] and
+        self.d[iMid:iEnd] into self.d[iStart:iEnd], using self.s as
+        scratch space.
+
+        The right chunk is parked in scratch space. In the last pass
+        it may be too big for it, in which case the left chunk (which
+        is then the smaller one) is parked instead and the right chunk
+        is moved down to iStart before merging. Either way the left
+        chunk is passed to mergeRL as src1, so that equal values keep
+        their original order (mergeRL sends ties to the src2 side).
+        """
+        if iEnd-iMid <= len(self.s):
+            # Copy right chunk into scratch space
+            self.lddr(self.d, iMid, iEnd,
+                      self.s, 0, iEnd-iMid)
+            # Merge chunks
+            self.mergeRL(self.d, iStart, iMid,
+                         self.s, 0, iEnd-iMid,
+                         self.d, iStart, iEnd)
+        else:
+            # Copy left chunk into scratch space
+            self.lddr(self.d, iStart, iMid,
+                      self.s, 0, iMid-iStart)
+            # Move right chunk to the left
+            self.lddr(self.d, iMid, iEnd,
+                      self.d, iStart, iStart+iEnd-iMid)
+            # Merge chunks, left one first to keep the sort stable
+            self.mergeRL(self.s, 0, iMid-iStart,
+                         self.d, iStart, iStart+iEnd-iMid,
+                         self.d, iStart, iEnd)
 
     def mergeRL(
             self,
@@ -151,12 +168,12 @@ class Sorter:
         for i in range(iEndDst-iStartDst):
             # Check if one of the subarrays has already been fully used
             if p1 < iStartSrc1:
-                Sorter.lddr(arraySrc2, iStartSrc2, p2+1,
-                            arrayDst, iStartDst, iEndDst-1-i)
+                self.lddr(arraySrc2, iStartSrc2, p2+1,
+                          arrayDst, iStartDst, iEndDst-i)
                 break
             elif p2 < iStartSrc2:
-                Sorter.lddr(arraySrc1, iStartSrc1, p1+1,
-                            arrayDst, iStartDst, iEndDst-1-i)
+                self.lddr(arraySrc1, iStartSrc1, p1+1,
+                          arrayDst, iStartDst, iEndDst-i)
                 break
             # Get min of two current positions in subarray
             # And put into destination array
@@ -166,6 +183,18 @@ class Sorter:
             else:
                 arrayDst[iEndDst-1-i] = arraySrc2[p2]
                 p2 -= 1
+        # Every item taken from a source before the other ran out took
+        # one comparison
+        self.countComparisons(iEndSrc1-1-p1 + iEndSrc2-1-p2)
+
+    def countComparisons(self, n):
+        """Record that mergeRL has just made n comparisons. This adds
+        them to the Sorter.mergeRL.comparisons counter of the
+        instrument module, if instrumentation is enabled; subclasses
+        that count comparisons themselves override it.
+        """
+        if instrument.enabled:
+            instrument.add('Sorter.mergeRL.comparisons', n)
 
     @staticmethod
     def lddr(arraySrc, iStartSrc, iEndSrc, arrayDst, iStartDst, iEndDst):
@@ -194,7 +223,7 @@ class Sorter:
         source region did, in the same order. If the regions didn't
         overlap, the source sregion is unchanged.
         """
-        if (arraySrc != arrayDst) | (iEndSrc >= iEndDst):
+        if arraySrc is not arrayDst or iEndSrc >= iEndDst:
             for i in range(iEndSrc-iStartSrc):
                 arrayDst[iStartDst+i] = arraySrc[iStartSrc+i]
         else:
@@ -210,3 +239,21 @@ class Sorter:
         """
         self.d = dataArray
         self.s = fsa.FixedSizeArray(len(dataArray) // 2)
+
+
+def coRank(k, x, iX, nX, y, iY, nY):
+    """Return how many of the first k items of the stable merge of the
+    sorted regions x[iX:iX+nX] and y[iY:iY+nY] come from x (ties going
+    to x), by binary search along the merge path. This is where a merge
+    can be cut so that the pieces on either side can be merged
+    independently: bums_parallel and bums_numpy both use it. x and y
+    can be anything indexable, fsa arrays, memoryviews or NumPy arrays.
+    """
+    lo, hi = max(0, k-nY), min(k, nX)
+    while lo < hi:
+        i = (lo+hi) // 2
+        if x[iX+i] <= y[iY+k-i-1]:
+            lo = i+1
+        else:
+            hi = i
+    return lo
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# bums_inplace.py
+
+"""Bottom-up mergesort, as in bums.py, with a selectable amount of
+scratch space, from the usual n//2 cells all the way down to none.
+
+Each merge uses the ordinary buffered merge of bums.Sorter whenever
+the smaller of its two chunks fits in scratch space. When it does
+not, the merge is done in place by rotation: the larger chunk is cut
+in half, the matching cut point is found in the other chunk by binary
+search, the two middle pieces are swapped with a block rotation, and
+the two resulting smaller merges are done in the same way. Rotations
+themselves go through scratch space when the smaller block fits, and
+are done by three reversals otherwise.
+
+With no scratch at all the sort takes O(n log^2 n) time; with about
+sqrt(n) cells most merges in the lower passes are buffered and only
+the top few passes pay for rotations. The merges are stable for any
+scratch size.
+"""
+
+from . import bums, fsa
+
+
+class InPlaceSorter(bums.Sorter):
+    """Bottom-up merge sort with a limited amount of scratch space. Use
+    it like bums.Sorter."""
+
+    def __init__(self, dataArray, scratchSize=None):
+        """Create an InPlaceSorter for the fsa array dataArray, with
+        scratchSize cells of scratch space: by default len(dataArray)//2,
+        as for bums.Sorter; for instance math.isqrt(len(dataArray)) for
+        O(sqrt(n)) extra memory, or 0 for none.
+        """
+        if scratchSize is None:
+            scratchSize = len(dataArray) // 2
+        self.d = dataArray
+        self.s = fsa.FixedSizeArray(scratchSize)
+
+    def mergeChunks(self, iStart, iMid, iEnd):
+        """Merge the sorted chunks self.d[iStart:iMid] and
+        self.d[iMid:iEnd] into self.d[iStart:iEnd], using as much of
+        self.s as there is.
+        """
+        d = self.d
+        while iStart < iMid < iEnd and d[iMid-1] > d[iMid]:
+            nLeft, nRight = iMid-iStart, iEnd-iMid
+            if min(nLeft, nRight) <= len(self.s):
+                super().mergeChunks(iStart, iMid, iEnd)
+                return
+            # Cut the larger chunk in half, and the smaller one where
+            # the first half's last item would go
+            if nLeft >= nRight:
+                iCutLeft = iStart + nLeft//2
+                iCutRight = self.lowerBound(iMid, iEnd, d[iCutLeft])
+            else:
+                iCutRight = iMid + nRight//2
+                iCutLeft = self.upperBound(iStart, iMid, d[iCutRight])
+            self.rotate(iCutLeft, iMid, iCutRight)
+            iNewMid = iCutLeft + iCutRight - iMid
+            # Recurse on the smaller half and loop on the larger one, so
+            # that the recursion depth stays logarithmic
+            if iNewMid - iStart <= iEnd - iNewMid:
+                self.mergeChunks(iStart, iCutLeft, iNewMid)
+                iStart, iMid = iNewMid, iCutRight
+            else:
+                self.mergeChunks(iNewMid, iCutRight, iEnd)
+                iMid, iEnd = iCutLeft, iNewMid
+
+    def lowerBound(self, iStart, iEnd, value):
+        """Return the index of the first item of the sorted region
+        self.d[iStart:iEnd] that is not smaller than value (iEnd if
+        there is none)."""
+        while iStart < iEnd:
+            i = (iStart+iEnd) // 2
+            if value > self.d[i]:
+                iStart = i+1
+            else:
+                iEnd = i
+        return iStart
+
+    def upperBound(self, iStart, iEnd, value):
+        """Return the index of the first item of the sorted region
+        self.d[iStart:iEnd] that is greater than value (iEnd if there
+        is none)."""
+        while iStart < iEnd:
+            i = (iStart+iEnd) // 2
+            if self.d[i] > value:
+                iEnd = i
+            else:
+                iStart = i+1
+        return iStart
+
+    def rotate(self, iStart, iMid, iEnd):
+        """Swap the adjacent blocks self.d[iStart:iMid] and
+        self.d[iMid:iEnd], so that the second now comes first, each
+        keeping its internal order.
+        """
+        nLeft, nRight = iMid-iStart, iEnd-iMid
+        if nLeft == 0 or nRight == 0:
+            return
+        if nRight <= len(self.s) and nRight <= nLeft:
+            self.lddr(self.d, iMid, iEnd, self.s, 0, nRight)
+            self.lddr(self.d, iStart, iMid, self.d, iEnd-nLeft, iEnd)
+            self.lddr(self.s, 0, nRight, self.d, iStart, iStart+nRight)
+        elif nLeft <= len(self.s):
+            self.lddr(self.d, iStart, iMid, self.s, 0, nLeft)
+            self.lddr(self.d, iMid, iEnd, self.d, iStart, iStart+nRight)
+            self.lddr(self.s, 0, nLeft, self.d, iEnd-nLeft, iEnd)
+        else:
+            self.reverse(iStart, iMid)
+            self.reverse(iMid, iEnd)
+            self.reverse(iStart, iEnd)
+
+    def reverse(self, iStart, iEnd):
+        """Reverse the order of the items in self.d[iStart:iEnd]."""
+        d = self.d
+        i, j = iStart, iEnd-1
+        while i < j:
+            d[i], d[j] = d[j], d[i]
+            i += 1
+            j -= 1
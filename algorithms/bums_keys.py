@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# bums_keys.py
+
+"""Bottom-up mergesort, as in bums.py, ordering the items by a key
+function and optionally in descending order, like Python's
+sorted(key=..., reverse=...).
+
+The key of each item is computed exactly once, into a key array that
+runs parallel to the data array (with its own n//2 cells of scratch
+space). Merges compare keys only, and every move of an item is
+mirrored on its key, so the items themselves never need to be
+comparable and no wrapper objects are created. When all the keys are
+ints or floats the key arrays are compact array.array objects.
+
+The sort is stable in both directions: items with equal keys keep
+their original relative order.
+"""
+
+import array
+
+from . import bums, fsa
+
+
+class KeySorter(bums.Sorter):
+    """Bottom-up merge sort by key. Use it like bums.Sorter."""
+
+    def __init__(self, dataArray, key=None, reverse=False):
+        """Create a KeySorter for the fsa array dataArray. If key is not
+        None, items are ordered by key(item) rather than by themselves;
+        if reverse is True, they are sorted in descending order.
+        """
+        super().__init__(dataArray)
+        self.reverse = reverse
+        if key is None:
+            self.k = self.ks = None
+        else:
+            keys = [key(dataArray[i]) for i in range(len(dataArray))]
+            self.k = _keyArray(keys)
+            self.ks = _keyArray(keys[:len(keys) // 2])
+
+    def keysOf(self, arrayData):
+        """Return the key array shadowing arrayData (self.d or self.s),
+        or arrayData itself when items are their own keys."""
+        if self.k is None:
+            return arrayData
+        return self.k if arrayData is self.d else self.ks
+
+    def mergeRL(
+            self,
+            arraySrc1, iStartSrc1, iEndSrc1,  # src1
+            arraySrc2, iStartSrc2, iEndSrc2,  # src2
+            arrayDst, iStartDst, iEndDst,  # dst
+            ):
+        """Same as bums.Sorter.mergeRL, but comparing keys and honouring
+        self.reverse. Ties still go to the src2 side, which keeps the
+        sort stable since src2 is always the right-hand chunk.
+        """
+        keys1 = self.keysOf(arraySrc1)
+        keys2 = self.keysOf(arraySrc2)
+        keysDst = self.keysOf(arrayDst)
+        reverse = self.reverse
+        p1 = iEndSrc1-1
+        p2 = iEndSrc2-1
+        for i in range(iEndDst-1, iStartDst-1, -1):
+            # Check if one of the subarrays has already been fully used
+            if p1 < iStartSrc1:
+                self.lddr(arraySrc2, iStartSrc2, p2+1,
+                          arrayDst, iStartDst, i+1)
+                break
+            elif p2 < iStartSrc2:
+                self.lddr(arraySrc1, iStartSrc1, p1+1,
+                          arrayDst, iStartDst, i+1)
+                break
+            # Take the src1 item only if it must strictly follow the
+            # src2 one
+            k1 = keys1[p1]
+            k2 = keys2[p2]
+            if (k1 < k2) if reverse else (k2 < k1):
+                arrayDst[i] = arraySrc1[p1]
+                keysDst[i] = k1
+                p1 -= 1
+            else:
+                arrayDst[i] = arraySrc2[p2]
+                keysDst[i] = k2
+                p2 -= 1
+
+    def lddr(self, arraySrc, iStartSrc, iEndSrc, arrayDst, iStartDst, iEndDst):
+        """Same as bums.Sorter.lddr, also copying the matching keys."""
+        bums.Sorter.lddr(arraySrc, iStartSrc, iEndSrc,
+                         arrayDst, iStartDst, iEndDst)
+        if self.k is not None:
+            bums.Sorter.lddr(self.keysOf(arraySrc), iStartSrc, iEndSrc,
+                             self.keysOf(arrayDst), iStartDst, iEndDst)
+
+
+def _keyArray(keys):
+    """Return the keys in an array.array if they are all ints (that fit
+    in 64 bits) or all floats, otherwise in an fsa.FixedSizeArray."""
+    for typecode, kind in (('q', int), ('d', float)):
+        if all(type(k) is kind for k in keys):
+            try:
+                return array.array(typecode, keys)
+            except OverflowError:
+                break
+    a = fsa.FixedSizeArray(len(keys))
+    for i, k in enumerate(keys):
+        a[i] = k
+    return a
@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# bums_numpy.py
+
+"""Bottom-up mergesort, as in bums.py, of numeric data held in a NumPy
+array, with every pass done by vectorised NumPy operations instead of
+item-by-item Python loops.
+
+The passes, and the chunk pairs merged in each pass, are exactly those
+of bums.Sorter (passes(), chunkSizeInPass()), and every merge is
+stable, so the result is identical to what bums.Sorter produces.
+
+How a pass is vectorised depends on its chunk size:
+
+- While chunks are small (up to ROW_CHUNK items), pairs are merged
+  many at a time, BLOCK items' worth of pairs at once. Each item's
+  final position within its pair is its own index plus the number of
+  items of the other chunk that must precede it, and that number is
+  found by a branch-free binary search run on all items in lockstep.
+
+- Once chunks are bigger than that, each pair is merged right to left,
+  BLOCK output items at a time, as mergeRL does one item at a time:
+  the merge path is cut (by binary search) BLOCK items before the end
+  of what is left to merge, and the two pieces beyond the cut are
+  merged with np.searchsorted and written back in one go.
+
+As in bums.Sorter, the smaller chunk of a pair is parked in n//2 cells
+of scratch space; apart from that, temporaries never exceed a few
+times BLOCK items, whatever the size of the array.
+"""
+
+import numpy as np
+
+from . import bums
+
+BLOCK = 1 << 16
+ROW_CHUNK = 128
+
+
+class NumpySorter(bums.Sorter):
+    """Bottom-up merge sort of numbers with NumPy. Use it like
+    bums.Sorter. The data may be an fsa array, which is copied into a
+    NumPy array for the duration of the sort, or a one-dimensional
+    NumPy array, which is sorted in place.
+    """
+
+    def __init__(self, dataArray, dtype=None):
+        """Create a NumpySorter for dataArray (an fsa array of numbers or
+        a NumPy array of a numeric dtype). For an fsa array, dtype
+        defaults to whatever NumPy infers from the values, except that
+        a mix of ints and floats raises TypeError: NumPy would make them
+        all floats, so the ints would not come back as they went in.
+        Pass a dtype to have the values converted to it.
+        """
+        if isinstance(dataArray, np.ndarray):
+            self.original = None
+            self.d = dataArray
+        else:
+            self.original = dataArray
+            values = [dataArray[i] for i in range(len(dataArray))]
+            if (dtype is None and any(isinstance(v, float) for v in values)
+                    and any(isinstance(v, int) for v in values)):
+                raise TypeError("cannot sort a mix of ints and floats with "
+                                "NumpySorter without a dtype to convert "
+                                "them to")
+            self.d = np.array(values, dtype=dtype)
+        if self.d.ndim != 1 or self.d.dtype.kind not in 'biuf':
+            raise TypeError(f"cannot sort a {self.d.ndim}-dimensional "
+                            f"array of {self.d.dtype} with NumpySorter")
+        self.s = np.empty(len(self.d) // 2, self.d.dtype)
+
+    def sort(self):
+        """Same as bums.Sorter.sort; an fsa array given to the
+        constructor receives the sorted values at the end."""
+        super().sort()
+        if self.original is not None:
+            for i, value in enumerate(self.d.tolist()):
+                self.original[i] = value
+
+    def mergePass(self, p):
+        """Same as bums.Sorter.mergePass, vectorised."""
+        n = len(self.d)
+        chunk = self.chunkSizeInPass(p)
+        pairs = n // (2*chunk)
+        iFull = n - 2*chunk*pairs
+        if chunk <= ROW_CHUNK:
+            rows = self.d[iFull:].reshape(pairs, 2*chunk)
+            for r in range(0, pairs, BLOCK // (2*chunk)):
+                _mergeRows(rows[r:r + BLOCK // (2*chunk)], chunk)
+        else:
+            for iEnd in range(n, iFull, -2*chunk):
+                self.mergeChunks(iEnd-2*chunk, iEnd-chunk, iEnd)
+        # The leftmost pair, if any, has a short left chunk
+        if iFull > chunk:
+            self.mergeChunks(0, iFull-chunk, iFull)
+
+    def mergeChunks(self, iStart, iMid, iEnd):
+        """Same as bums.Sorter.mergeChunks, BLOCK items at a time."""
+        d, s = self.d, self.s
+        nLeft, nRight = iMid-iStart, iEnd-iMid
+        if nRight <= len(s):
+            s[:nRight] = d[iMid:iEnd]
+            left, right = d[iStart:iMid], s[:nRight]
+        else:
+            s[:nLeft] = d[iStart:iMid]
+            # Move right chunk to the left, in blocks so that any
+            # temporary copy NumPy makes of overlapping blocks is small
+            for j in range(0, nRight, BLOCK):
+                jEnd = min(j+BLOCK, nRight)
+                d[iStart+j:iStart+jEnd] = d[iMid+j:iMid+jEnd]
+            left, right = s[:nLeft], d[iStart:iStart+nRight]
+
+        # Merge right to left: whichever chunk stayed in d now starts at
+        # iStart, so the output never catches up with unread items
+        total = nLeft+nRight
+        while total > 0:
+            k = max(0, total-BLOCK)
+            i = bums.coRank(k, left, 0, nLeft, right, 0, nRight)
+            merged = _mergeTwo(left[i:nLeft], right[k-i:nRight])
+            d[iStart+k:iStart+total] = merged
+            nLeft, nRight, total = i, k-i, k
+
+
+def _mergeTwo(x, y):
+    """Return a new array with the stable merge of the sorted arrays x
+    and y (ties going to x)."""
+    merged = np.empty(len(x)+len(y), np.result_type(x, y))
+    merged[np.arange(len(x)) + np.searchsorted(y, x, 'left')] = x
+    merged[np.arange(len(y)) + np.searchsorted(x, y, 'right')] = y
+    return merged
+
+
+def _mergeRows(rows, chunk):
+    """Merge, in place, the two sorted halves of every row of the
+    2-D array rows, whose rows are 2*chunk items long."""
+    left, right = rows[:, :chunk], rows[:, chunk:]
+    columns = np.arange(chunk)
+    whichRow = np.arange(len(rows))[:, None]
+    merged = np.empty_like(rows)
+    merged[whichRow, columns + _countBefore(right, left, False)] = left
+    merged[whichRow, columns + _countBefore(left, right, True)] = right
+    rows[:] = merged
+
+
+def _countBefore(runs, values, inclusive):
+    """For every item of values, count the items in the same row of
+    runs that are smaller than it (or smaller or equal, if inclusive).
+    Both arguments are 2-D arrays with the same shape, and every row
+    of runs is sorted.
+
+    This is the branch-free binary search: all items take the same
+    number of halving steps, so each step is one vectorised operation
+    over the whole array.
+    """
+    before = np.less_equal if inclusive else np.less
+    base = np.zeros(values.shape, np.intp)
+    length = runs.shape[1]
+    while length > 1:
+        half = length // 2
+        probe = np.take_along_axis(runs, base+half, axis=1)
+        base += half * before(probe, values)
+        length -= half
+    base += before(np.take_along_axis(runs, base, axis=1), values)
+    return base
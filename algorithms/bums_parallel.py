@@ -0,0 +1,245 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# bums_parallel.py
+
+"""Bottom-up mergesort, as in bums.py, spread over a pool of worker
+processes.
+
+The values are copied once into a shared memory block, next to a
+second block holding the usual n//2 cells of scratch space. Workers
+attach to both blocks by name, so no values are ever pickled: a task
+is just a handful of indices. The copies into and out of the shared
+block go COPY_CHUNK values at a time, so neither needs a temporary
+the size of the array on top of the blocks.
+
+The sort proceeds in two stages. First the array is cut into at most
+one contiguous segment per worker, along the chunk boundaries of the
+sequential schedule, and each worker sorts its segment on its own.
+Then the remaining passes are run one at a time, all the chunk pairs
+of a pass being merged concurrently; when a pass has fewer pairs than
+workers (the last pass always has a single one) each merge is further
+split along its merge path, so that every worker gets a slice of it.
+
+A merge of self.d[iStart:iEnd] only ever uses the scratch cells
+self.s[iStart//2:iEnd//2], so concurrent merges never collide in
+scratch space and the total stays within the n//2 budget of
+bums.Sorter.
+"""
+
+import array
+import concurrent.futures
+import contextlib
+import os
+from multiprocessing import shared_memory
+
+from . import bums
+
+COPY_CHUNK = 1 << 14
+
+
+class ParallelSorter(bums.Sorter):
+    """Bottom-up merge sort of numeric data on a pool of worker
+    processes. Use it like bums.Sorter. All the values must fit in an
+    array of the given typecode ('q' for integers, 'd' for floats), and
+    are converted to its type; by default the typecode is chosen by
+    looking at the data, and a mix of ints and floats raises TypeError,
+    as the ints would come back as floats.
+    """
+
+    def __init__(self, dataArray, workers=None, typecode=None):
+        """Create a ParallelSorter for the fsa array dataArray, to be
+        sorted by the given number of worker processes (by default,
+        one per CPU). Scratch space is only allocated, in shared
+        memory, while sort() runs.
+        """
+        self.d = dataArray
+        self.s = None
+        self.workers = workers or os.cpu_count() or 1
+        if typecode is None:
+            kinds = {float if isinstance(dataArray[i], float) else int
+                     for i in range(len(dataArray))}
+            if len(kinds) > 1:
+                raise TypeError("cannot sort a mix of ints and floats with "
+                                "ParallelSorter without a typecode to "
+                                "convert them to")
+            typecode = 'd' if float in kinds else 'q'
+        self.typecode = typecode
+
+    def segmentPasses(self):
+        """Return the number of passes that are done by the workers
+        independently, each inside its own segment: the smallest p
+        such that chunks of size 2^p leave at most one chunk per
+        worker.
+        """
+        n = len(self.d)
+        p = 0
+        while (p < self.passes()
+               and -(-n // self.chunkSizeInPass(p)) > self.workers):
+            p += 1
+        return p
+
+    def sort(self):
+        """Sort the values in self.d in ascending order, leaving them in
+        self.d. Same postcondition as bums.Sorter.sort.
+        """
+        n = len(self.d)
+        if n < 2:
+            return
+        itemSize = array.array(self.typecode).itemsize
+        with contextlib.ExitStack() as stack:
+            shms = []
+            for size in (n, n // 2):
+                shm = shared_memory.SharedMemory(
+                    create=True, size=max(1, size * itemSize))
+                stack.callback(shm.unlink)
+                stack.callback(shm.close)
+                shms.append(shm)
+            d, s = _typedViews(stack, shms, self.typecode, n)
+            shared = (shms[0].name, shms[1].name, self.typecode, n)
+            self.s = s
+
+            _copyIn(self.d, d, self.typecode)
+            with concurrent.futures.ProcessPoolExecutor(self.workers) as pool:
+                firstPass = self.segmentPasses()
+                if firstPass > 0:
+                    size = 2 ** firstPass
+                    _runAll(pool, _sortSegment, shared,
+                            [(max(0, iEnd-size), iEnd)
+                             for iEnd in range(n, 0, -size)])
+                for p in range(firstPass, self.passes()):
+                    pairs = list(self.chunkPairsInPass(p))
+                    parts = max(1, self.workers // len(pairs))
+                    tasks = []
+                    for iStart, iMid, iEnd in pairs:
+                        tasks += _planMerge(d, s, iStart, iMid, iEnd, parts)
+                    _runAll(pool, _mergePart, shared, tasks)
+
+            _copyOut(d, self.d)
+            self.s = None
+
+
+def _copyIn(a, view, typecode):
+    """Copy the fsa array a into the typed memoryview view, a chunk at
+    a time."""
+    for iStart in range(0, len(a), COPY_CHUNK):
+        iEnd = min(len(a), iStart + COPY_CHUNK)
+        view[iStart:iEnd] = array.array(typecode,
+                                        (a[i] for i in range(iStart, iEnd)))
+
+
+def _copyOut(view, a):
+    """Copy the typed memoryview view back into the fsa array a, a
+    chunk at a time."""
+    for iStart in range(0, len(a), COPY_CHUNK):
+        with view[iStart:iStart + COPY_CHUNK] as part:
+            for i, value in enumerate(part.tolist(), iStart):
+                a[i] = value
+
+
+def _runAll(pool, fn, shared, tasks):
+    """Run fn(shared, *task) for every task on the pool and wait for all
+    of them, re-raising the first failure."""
+    futures = [pool.submit(fn, shared, *task) for task in tasks]
+    for future in futures:
+        future.result()
+
+
+def _attach(stack, dataName, scratchName, typecode, n):
+    """Attach to the shared data and scratch blocks by name and return
+    their typed views (see _typedViews). The blocks are closed when
+    the ExitStack unwinds."""
+    shms = []
+    for name in (dataName, scratchName):
+        shm = shared_memory.SharedMemory(name=name)
+        stack.callback(shm.close)
+        shms.append(shm)
+    return _typedViews(stack, shms, typecode, n)
+
+
+def _typedViews(stack, shms, typecode, n):
+    """Return the data and scratch blocks as memoryviews of n and n//2
+    items of the given typecode, to be released when the ExitStack
+    unwinds (they must be, before the blocks can be closed)."""
+    itemSize = array.array(typecode).itemsize
+    views = []
+    for shm, size in zip(shms, (n, n // 2)):
+        view = _slice(stack, shm.buf, 0, size*itemSize).cast(typecode)
+        stack.callback(view.release)
+        views.append(view)
+    return views
+
+
+def _slice(stack, view, iStart, iEnd):
+    """Return view[iStart:iEnd], to be released when the ExitStack
+    unwinds."""
+    part = view[iStart:iEnd]
+    stack.callback(part.release)
+    return part
+
+
+def _planMerge(d, s, iStart, iMid, iEnd, parts):
+    """Prepare the merge of the sorted runs d[iStart:iMid] and
+    d[iMid:iEnd] as up to `parts` independent right-to-left merges,
+    and return their (src1, src2, dst) descriptors for _mergePart.
+
+    As in Sorter.mergeChunks, one run is parked in scratch space and
+    the other stays in d, starting at iStart. The merge path is then
+    cut at evenly spaced output ranks, and the pieces of the run in d
+    are moved up (highest first, so that none is overwritten) until
+    each starts where its part of the output starts, which is what a
+    right-to-left merge needs to work in place.
+    """
+    nLeft, nRight = iMid-iStart, iEnd-iMid
+    iScratch = iStart // 2
+    if nRight <= iEnd//2 - iScratch:
+        s[iScratch:iScratch+nRight] = d[iMid:iEnd]
+        left, right = ('d', iStart), ('s', iScratch)
+    else:
+        s[iScratch:iScratch+nLeft] = d[iStart:iMid]
+        d[iStart:iStart+nRight] = d[iMid:iEnd]
+        left, right = ('s', iScratch), ('d', iStart)
+    arrays = {'d': d, 's': s}
+
+    total = nLeft+nRight
+    ranks = [t*total // parts for t in range(parts+1)]
+    splits = [bums.coRank(k, arrays[left[0]], left[1], nLeft,
+                          arrays[right[0]], right[1], nRight)
+              for k in ranks]
+    tasks = []
+    for t in reversed(range(parts)):
+        k, kNext = ranks[t], ranks[t+1]
+        if k == kNext:
+            continue
+        runs = []
+        for (where, base), i, iNext in ((left, splits[t], splits[t+1]),
+                                        (right, k-splits[t], kNext-splits[t+1])):
+            if where == 'd':
+                d[iStart+k:iStart+k+iNext-i] = d[base+i:base+iNext]
+                runs += ['d', iStart+k, iStart+k+iNext-i]
+            else:
+                runs += ['s', base+i, base+iNext]
+        tasks.append(tuple(runs) + (iStart+k, iStart+kNext))
+    return tasks
+
+
+def _sortSegment(shared, iStart, iEnd):
+    """Worker: sort d[iStart:iEnd] with the sequential algorithm, using
+    its own share of the scratch space."""
+    with contextlib.ExitStack() as stack:
+        d, s = _attach(stack, *shared)
+        sorter = bums.Sorter.__new__(bums.Sorter)
+        sorter.d = _slice(stack, d, iStart, iEnd)
+        sorter.s = _slice(stack, s, iStart//2, iStart//2 + (iEnd-iStart)//2)
+        sorter.sort()
+
+
+def _mergePart(shared, src1, iStartSrc1, iEndSrc1,
+               src2, iStartSrc2, iEndSrc2, iStartDst, iEndDst):
+    """Worker: merge one part planned by _planMerge into d."""
+    with contextlib.ExitStack() as stack:
+        d, s = _attach(stack, *shared)
+        arrays = {'d': d, 's': s}
+        bums.Sorter.__new__(bums.Sorter).mergeRL(
+            arrays[src1], iStartSrc1, iEndSrc1,
+            arrays[src2], iStartSrc2, iEndSrc2,
+            d, iStartDst, iEndDst)
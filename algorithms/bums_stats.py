@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# bums_stats.py
+
+"""Instrumented version of the bottom-up mergesort in bums.py.
+
+InstrumentedSorter behaves exactly like bums.Sorter, and performs
+exactly the same comparisons and moves, but it also counts them and
+times every pass, leaving the figures in its stats attribute (a
+SortStats). The comparisons are the ones bums.Sorter.mergeRL reports
+through countComparisons, so the merge itself is not duplicated here;
+moves and scratch usage are counted by overriding lddr.
+"""
+
+import time
+
+from . import bums
+
+
+class SortStats:
+    """Counters filled in by an InstrumentedSorter.
+
+    comparisons: number of item comparisons made by mergeRL.
+    moves: number of item writes, by mergeRL and by lddr.
+    scratchHighWater: number of scratch cells actually used, i.e. one
+        more than the highest scratch index ever written.
+    passTimes: list of (chunkSize, seconds) pairs, one per pass, in
+        the order in which the passes were performed.
+    """
+
+    def __init__(self):
+        self.comparisons = 0
+        self.moves = 0
+        self.scratchHighWater = 0
+        self.passTimes = []
+
+    def asDict(self):
+        """Return the counters as a dictionary (suitable for JSON)."""
+        return {
+            'comparisons': self.comparisons,
+            'moves': self.moves,
+            'scratchHighWater': self.scratchHighWater,
+            'passTimes': [list(pt) for pt in self.passTimes],
+        }
+
+    def __repr__(self):
+        return f"SortStats({self.asDict()!r})"
+
+
+class InstrumentedSorter(bums.Sorter):
+    """bums.Sorter that records a SortStats in self.stats."""
+
+    def __init__(self, dataArray):
+        super().__init__(dataArray)
+        self.stats = SortStats()
+
+    def mergePass(self, p):
+        """Same as bums.Sorter.mergePass, timing the pass."""
+        start = time.perf_counter()
+        super().mergePass(p)
+        self.stats.passTimes.append(
+            (self.chunkSizeInPass(p), time.perf_counter() - start))
+
+    def countComparisons(self, n):
+        """Same as bums.Sorter.countComparisons, also counting the
+        comparisons, and the moves that go with them (mergeRL writes
+        one item per comparison, the rest through lddr), in self.stats."""
+        super().countComparisons(n)
+        self.stats.comparisons += n
+        self.stats.moves += n
+
+    def lddr(self, arraySrc, iStartSrc, iEndSrc, arrayDst, iStartDst, iEndDst):
+        """Same as bums.Sorter.lddr, counting moves and scratch usage."""
+        bums.Sorter.lddr(arraySrc, iStartSrc, iEndSrc,
+                         arrayDst, iStartDst, iEndDst)
+        self.stats.moves += iEndSrc-iStartSrc
+        if arrayDst is self.s and iEndSrc > iStartSrc:
+            self.stats.scratchHighWater = max(
+                self.stats.scratchHighWater, iStartDst+iEndSrc-iStartSrc)
@@ -0,0 +1,175 @@
+from array import array
+from collections import defaultdict, deque
+
+from .csr import CSRGraph
+
+WHITE, GREY, BLACK = 0, 1, 2  # unvisited, on the DFS path, finished
+_DONE = object()
+
+def topologicalSort(g):
+    # Iterative three-colour DFS over g (each vertex mapped to a set of
+    # successors) in O(V+E), with an explicit stack so deep graphs do not
+    # hit the recursion limit. Returns (order, None) with the vertices in
+    # topological order if g is a DAG, otherwise (None, cycle) with the
+    # vertices of a cycle in edge order. g may also be a CSRGraph, which
+    # is searched by vertex number with the colours in a bytearray.
+    if isinstance(g, CSRGraph):
+        order, cycle = _search(range(len(g)), g.successors, bytearray(len(g)))
+        labels = g.labels
+        if cycle is not None:
+            return None, [labels[v] for v in cycle]
+        return [labels[v] for v in order], None
+    # Vertices that only appear as successors start WHITE too
+    return _search(g, lambda v: g.get(v) or (), defaultdict(int))
+
+def _search(vertices, successors, colour):
+    order = []
+    for root in vertices:
+        if colour[root] != WHITE:
+            continue
+        colour[root] = GREY
+        path = [root]
+        stack = [iter(successors(root))]
+        while stack:
+            w = next(stack[-1], _DONE)
+            if w is _DONE:
+                stack.pop()
+                v = path.pop()
+                colour[v] = BLACK
+                order.append(v)
+            elif colour[w] == GREY:
+                # Back edge: w is on the current path
+                return None, path[path.index(w):]
+            elif colour[w] == WHITE:
+                colour[w] = GREY
+                path.append(w)
+                stack.append(iter(successors(w)))
+    order.reverse()
+    return order, None
+
+def isDag(g):
+    return topologicalSort(g)[1] is None
+
+def kahn(g):
+    # Kahn's algorithm: yield the vertices of g in topological order as
+    # soon as each one's predecessors have all been yielded. Raises
+    # ValueError at the end if g has a cycle (the vertices on or after
+    # it are never yielded).
+    indegree = {v: 0 for v in g}
+    for v in g:
+        for w in g[v] or ():
+            indegree[w] = indegree.get(w, 0) + 1
+    ready = deque(v for v, d in indegree.items() if d == 0)
+    emitted = 0
+    while ready:
+        v = ready.popleft()
+        yield v
+        emitted += 1
+        for w in g.get(v) or ():
+            indegree[w] -= 1
+            if indegree[w] == 0:
+                ready.append(w)
+    if emitted < len(indegree):
+        raise ValueError("graph has a cycle")
+
+def stronglyConnectedComponents(g):
+    # Iterative Tarjan's algorithm in O(V+E) over g, a dict of sets or a
+    # CSRGraph, with explicit stacks so there is no recursion limit.
+    # Returns (labels, component, count): labels[i] is the vertex
+    # numbered i and component[i] (an array('q')) is the id of its
+    # strongly connected component, from 0 to count-1. Ids are in
+    # topological order of the condensation: every edge between two
+    # components goes from a lower id to a higher one.
+    if not isinstance(g, CSRGraph):
+        g = CSRGraph.from_adjacency(g)
+    n = len(g)
+    offsets, targets = g.offsets, g.targets
+    index = array('q', [-1]) * n  # order in which vertices are reached
+    low = array('q', [0]) * n  # lowest index reachable within the DFS subtree
+    nextEdge = array('q', offsets[:-1])
+    onStack = bytearray(n)
+    component = array('q', [-1]) * n
+    stack = array('q')  # reached vertices not yet in a component
+    path = array('q')  # the DFS path
+    reached = count = 0
+    for root in range(n):
+        if index[root] >= 0:
+            continue
+        index[root] = low[root] = reached
+        reached += 1
+        stack.append(root)
+        onStack[root] = 1
+        path.append(root)
+        while path:
+            v = path[-1]
+            i = nextEdge[v]
+            if i < offsets[v + 1]:
+                nextEdge[v] = i + 1
+                w = targets[i]
+                if index[w] < 0:
+                    index[w] = low[w] = reached
+                    reached += 1
+                    stack.append(w)
+                    onStack[w] = 1
+                    path.append(w)
+                elif onStack[w] and index[w] < low[v]:
+                    low[v] = index[w]
+                continue
+            # All of v's edges are done
+            path.pop()
+            if low[v] == index[v]:
+                # v is the root of a component: everything above it on
+                # the stack
+                while True:
+                    w = stack.pop()
+                    onStack[w] = 0
+                    component[w] = count
+                    if w == v:
+                        break
+                count += 1
+            if path and low[v] < low[path[-1]]:
+                low[path[-1]] = low[v]
+    # Tarjan finds components in reverse topological order
+    for v in range(n):
+        component[v] = count - 1 - component[v]
+    return g.labels, component, count
+
+def condensation(g):
+    # The DAG of g's strongly connected components. Returns (labels,
+    # component, dag) as for stronglyConnectedComponents, dag being a
+    # CSRGraph whose vertices are the component ids, with one edge for
+    # each pair of components joined by at least one edge of g.
+    if not isinstance(g, CSRGraph):
+        g = CSRGraph.from_adjacency(g)
+    labels, component, count = stronglyConnectedComponents(g)
+    offsets, targets = g.offsets, g.targets
+    # Vertices grouped by component (counting sort)
+    start = array('q', [0]) * (count + 1)
+    for c in component:
+        start[c + 1] += 1
+    for c in range(count):
+        start[c + 1] += start[c]
+    members = array('q', [0]) * len(g)
+    free = start[:-1]
+    for v, c in enumerate(component):
+        members[free[c]] = v
+        free[c] += 1
+
+    dagOffsets = array('q', [0])
+    dagTargets = array('q')
+    lastFrom = array('q', [-1]) * count  # last component with an edge to each
+    for c in range(count):
+        for j in range(start[c], start[c + 1]):
+            v = members[j]
+            for i in range(offsets[v], offsets[v + 1]):
+                d = component[targets[i]]
+                if d != c and lastFrom[d] != c:
+                    lastFrom[d] = c
+                    dagTargets.append(d)
+        dagOffsets.append(len(dagTargets))
+    return labels, component, CSRGraph(list(range(count)), dagOffsets, dagTargets)
+
+if __name__ == '__main__':
+    graph = {1: {2}, 2: {3}, 3: {1}}
+
+    print(isDag(graph))
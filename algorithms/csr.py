@@ -0,0 +1,104 @@
+from array import array
+
+
+class CSRGraph:
+    # A directed graph packed into flat arrays (compressed sparse row
+    # form), shared by the graph algorithms and maxflow.
+    #
+    # Vertices are numbered 0..n-1: labels[i] is the vertex numbered i
+    # and index maps each label back to its number, so every label is
+    # stored once however many edges it is on. The edges out of vertex
+    # u go to targets[offsets[u]:offsets[u+1]], with their weights (or
+    # capacities) in the same slots of weights, which is None for an
+    # unweighted graph. offsets and targets are array('q'), and weights
+    # array('q') if every weight is an int or array('d') otherwise;
+    # NumPy arrays work in their place (see to_numpy).
+    def __init__(self, labels, offsets, targets, weights=None, index=None):
+        if index is None:
+            index = {v: i for i, v in enumerate(labels)}
+        self.labels = labels
+        self.index = index
+        self.offsets = offsets
+        self.targets = targets
+        self.weights = weights
+
+    @classmethod
+    def from_adjacency(cls, g):
+        # From a dict mapping each vertex to an iterable of neighbours (a
+        # set, or None for no neighbours), as used by shortest_paths and
+        # isDag
+        return cls._pack(g, lambda u: ((v, None) for v in g[u] or ()), False)
+
+    @classmethod
+    def from_weighted(cls, g):
+        # From a dict mapping each vertex to a dict {neighbour: weight},
+        # as used by bf
+        return cls._pack(g, lambda u: g[u].items(), True)
+
+    @classmethod
+    def from_capacities(cls, capacity):
+        # From a dict mapping each edge (u, v) to its capacity, as used by
+        # compute_max_flow
+        return cls.from_edges((u, v, c) for (u, v), c in capacity.items())
+
+    @classmethod
+    def from_edges(cls, edges):
+        # From an iterable of (u, v, weight) triples
+        out = {}
+        for u, v, w in edges:
+            out.setdefault(u, []).append((v, w))
+        return cls._pack(out, out.__getitem__, True)
+
+    @classmethod
+    def _pack(cls, g, edges_of, weighted):
+        # Vertices are numbered in the order of g, then vertices that only
+        # appear as targets in the order they are met
+        labels = list(g)
+        index = {v: i for i, v in enumerate(labels)}
+        offsets = array('q', [0])
+        targets = array('q')
+        weights = []
+        for u in g:
+            for v, w in edges_of(u):
+                if v not in index:
+                    index[v] = len(labels)
+                    labels.append(v)
+                targets.append(index[v])
+                weights.append(w)
+            offsets.append(len(targets))
+        offsets.extend([len(targets)] * (len(labels) + 1 - len(offsets)))
+        if not weighted:
+            weights = None
+        elif all(type(w) is int for w in weights):
+            weights = array('q', weights)
+        else:
+            weights = array('d', weights)
+        return cls(labels, offsets, targets, weights, index)
+
+    def __len__(self):
+        return len(self.labels)
+
+    def edge_count(self):
+        return len(self.targets)
+
+    def successors(self, u):
+        # Numbers of the vertices that vertex number u has edges to
+        return self.targets[self.offsets[u]:self.offsets[u + 1]]
+
+    def edges(self, u):
+        # (target, weight) pairs of the edges out of vertex number u
+        start, end = self.offsets[u], self.offsets[u + 1]
+        return zip(self.targets[start:end], self.weights[start:end])
+
+    def nbytes(self):
+        # Memory held by the arrays (not the labels)
+        return sum(a.itemsize * len(a) for a in
+                   (self.offsets, self.targets, self.weights) if a is not None)
+
+    def to_numpy(self):
+        # The same graph with NumPy views of the arrays (no copying)
+        import numpy as np
+        offsets, targets, weights = (
+            None if a is None else np.asarray(a)
+            for a in (self.offsets, self.targets, self.weights))
+        return CSRGraph(self.labels, offsets, targets, weights, self.index)
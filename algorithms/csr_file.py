@@ -0,0 +1,174 @@
+from array import array
+import csv
+import mmap
+import struct
+import sys
+
+from .csr import CSRGraph
+
+# Binary CSRGraph files, which load by mapping the file into memory
+# instead of parsing it.
+#
+# A file is a 32-byte header, then the offsets, targets and weights
+# arrays exactly as they are in memory (8-byte ints, and 8-byte ints
+# or doubles for the weights, in the writer's byte order), then the
+# vertex labels. The header is
+#
+#   magic        4s  b'CSRG'
+#   version      B   1
+#   byte order   c   b'<' or b'>'
+#   weights      c   b'q', b'd', or b'-' for an unweighted graph
+#   labels       c   b'q' for int labels stored as an array, b's' for
+#                    str labels stored UTF-8 encoded, separated by NULs
+#   n, m         2q  numbers of vertices and edges
+#   label bytes  q   size of the labels section
+#
+# so every array starts 8-byte aligned.
+#
+# load() returns a CSRGraph whose arrays are memoryviews of the mapped
+# file, so only the labels (one per vertex) are read in; the edges are
+# paged in by the OS as the algorithms touch them.
+
+MAGIC = b'CSRG'
+VERSION = 1
+_HEADER = struct.Struct('<4sBcccqqq')
+_BYTE_ORDER = b'<' if sys.byteorder == 'little' else b'>'
+
+def save(g, path):
+    # Write the CSRGraph g to path. Labels must all be ints or all be
+    # strs (without NULs).
+    if all(type(v) is int for v in g.labels):
+        label_kind, label_bytes = b'q', array('q', g.labels).tobytes()
+    elif all(type(v) is str and '\0' not in v for v in g.labels):
+        label_kind, label_bytes = b's', '\0'.join(g.labels).encode()
+    else:
+        raise ValueError("labels must all be ints or all be strs")
+    weights = g.weights
+    if weights is None:
+        weight_kind = b'-'
+    elif len(weights) and isinstance(weights[0], float):
+        weight_kind = b'd'
+    else:
+        weight_kind = b'q'
+    with open(path, 'wb') as f:
+        f.write(_HEADER.pack(MAGIC, VERSION, _BYTE_ORDER, weight_kind, label_kind,
+                             len(g), len(g.targets), len(label_bytes)))
+        f.write(array('q', g.offsets).tobytes())
+        f.write(array('q', g.targets).tobytes())
+        if weights is not None:
+            f.write(array(weight_kind.decode(), weights).tobytes())
+        f.write(label_bytes)
+
+def load(path):
+    # Map the file at path and return the CSRGraph in it
+    with open(path, 'rb') as f:
+        mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    (magic, version, byte_order, weight_kind, label_kind,
+     n, m, label_size) = _HEADER.unpack_from(mapped)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError(f"{path} is not a version {VERSION} CSR graph file")
+    if byte_order != _BYTE_ORDER:
+        raise ValueError(f"{path} was written with the other byte order")
+
+    view = memoryview(mapped)
+    position = _HEADER.size
+    def take(size, typecode):
+        nonlocal position
+        section = view[position:position + size]
+        position += size
+        return section.cast(typecode)
+    offsets = take(8 * (n + 1), 'q')
+    targets = take(8 * m, 'q')
+    weights = None if weight_kind == b'-' else take(8 * m, weight_kind.decode())
+    labels = take(label_size, 'B')
+    if label_kind == b'q':
+        labels = labels.cast('q').tolist()
+    else:
+        labels = bytes(labels).decode().split('\0') if n else []
+    index = dict(zip(labels, range(n)))
+    return CSRGraph(labels, offsets, targets, weights, index)
+
+def from_csv(path):
+    # Read a graph from an edge-list CSV with a header row and u,v,weight
+    # rows, like the flownetwork_*.csv files. Labels stay strings;
+    # weights are ints unless one of them is not.
+    with open(path, newline='') as f:
+        return read_csv(f)
+
+def read_csv(f):
+    # from_csv, from a file that is already open (such as stdin). Rows
+    # are streamed straight into arrays of 8 bytes per edge, and every
+    # weight is parsed once: as an int until one of them is not, when
+    # the weights read so far are converted to doubles. Vertices are
+    # numbered as CSRGraph.from_edges would number them.
+    rows = csv.reader(f)
+    next(rows, None)
+    index = {}
+    tails, heads, weights = array('q'), array('q'), array('q')
+    parse = int
+    for u, v, w in rows:
+        tails.append(index.setdefault(u, len(index)))
+        heads.append(index.setdefault(v, len(index)))
+        try:
+            weights.append(parse(w))
+        except ValueError:
+            if parse is float:
+                raise
+            parse = float
+            weights = array('d', weights)
+            weights.append(float(w))
+    labels = list(index)
+    del index
+    return _pack(labels, tails, heads, weights)
+
+def _pack(labels, tails, heads, weights):
+    # The CSRGraph of the edges tails[e] -> heads[e] with weights[e],
+    # over vertices numbered by their labels' positions in labels.
+    # Renumbers them as CSRGraph.from_edges does: sources in the order
+    # they first appear as one, then vertices that are only targets in
+    # the order their edges are packed. tails, heads and weights are
+    # emptied once packed, so their memory can be reused.
+    n, m = len(labels), len(tails)
+    number = array('q', [-1]) * n
+    sources = 0
+    for u in tails:
+        if number[u] < 0:
+            number[u] = sources
+            sources += 1
+    offsets = array('q', [0]) * (n + 1)
+    for u in tails:
+        offsets[number[u] + 1] += 1
+    for u in range(n):
+        offsets[u + 1] += offsets[u]
+
+    # Counting sort of the edges by source, keeping their order
+    free = offsets[:-1]
+    targets = array('q', [0]) * m
+    packed = array(weights.typecode, [0]) * m
+    for e in range(m):
+        u = number[tails[e]]
+        targets[free[u]] = heads[e]
+        packed[free[u]] = weights[e]
+        free[u] += 1
+    del tails[:], heads[:], weights[:]
+
+    count = sources
+    for i in range(m):
+        v = number[targets[i]]
+        if v < 0:
+            v = number[targets[i]] = count
+            count += 1
+        targets[i] = v
+    numbered = [None] * n
+    for v, label in zip(number, labels):
+        numbered[v] = label
+    return CSRGraph(numbered, offsets, targets, packed)
+
+
+if __name__ == '__main__':
+    # Convert an edge-list CSV to a CSR graph file
+    if len(sys.argv) != 3:
+        sys.exit("usage: python -m algorithms.csr_file EDGES.csv GRAPH.csr")
+    graph = from_csv(sys.argv[1])
+    save(graph, sys.argv[2])
+    print(f"{len(graph)} vertices, {graph.edge_count()} edges")
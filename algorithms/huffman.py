@@ -1,7 +1,8 @@
 # pylint: disable=invalid-name, misplaced-comparison-constant
 
 import heapq
-import bitstring  # see this class's docstring for where to get this
+
+from . import instrument
 
 
 class HuffmanCode:
@@ -44,6 +45,7 @@ class HuffmanCode:
 
         
 
+    @instrument.timed('HuffmanCode.encode')
     def encode(self, plaintextBytes):
         """Take a bytes object (immutable array of bytes) to be
         encoded. Encode it by replacing each of its bytes with the
@@ -53,9 +55,16 @@ class HuffmanCode:
         suitable padding (cfr paddingSuitableFor and removePadding
         methods).
         """
+        # bitstring is imported on first use rather than with this
+        # module, which is then cheap to import where it is not needed
+        import bitstring
         codeword = bitstring.BitArray('0b0')
+        # Each distinct byte's codeword is looked up in the tree once
+        codewords = {}
         for byte in plaintextBytes:
-            codeword.append(self.codewordFor(byte.to_bytes(1, 'big')))
+            if byte not in codewords:
+                codewords[byte] = self.codewordFor(byte.to_bytes(1, 'big'))
+            codeword.append(codewords[byte])
         
         del codeword[0]
         codeword.append(self.paddingSuitableFor(codeword))
@@ -64,6 +73,7 @@ class HuffmanCode:
 
 
 
+    @instrument.timed('HuffmanCode.decode')
     def decode(self, encodedAndPaddedBits):
         """Take a bitstring to be decoded, consisting logically of a sequence
         of codewords followed by padding, but practically of an
@@ -86,6 +96,10 @@ class HuffmanCode:
                 t = self.tree
                 continue
             
+        if instrument.enabled:
+            # One tree step per bit
+            instrument.add('HuffmanCode.decode.treeSteps', len(bits))
+            instrument.add('HuffmanCode.decode.symbols', len(decoded))
 
         return decoded
 
@@ -117,6 +131,7 @@ class HuffmanCode:
             else:
                 raise WrongSymbolException()
 
+        import bitstring
         codeword = treeSearch(self.tree, bitstring.BitArray('0b0'))
         # Remove extra 0 from start of codeword
         del codeword[0]
@@ -133,6 +148,7 @@ class HuffmanCode:
         length = 8 - len(bits) % 8 
         if length == 0:
             length += 8
+        import bitstring
         padding = bitstring.BitArray('0b1')
         length -= 1
         while length > 0:
@@ -144,13 +160,14 @@ class HuffmanCode:
     @staticmethod
     def removePadding(bits):
         """Take a padded bitstring, whose length will be a multiple of
-        8. Return a new (mutable) bitstring.BitStream obtained from
+        8. Return a new (mutable) bitstring.BitArray obtained from
         the previous one by removing the padding (without changing the
         original). Take away all consecutive trailing 0s, if any, and
         then the first 1. The returned result will be 1 to 8 bits
         shorter than the input.
         """
-        bits = bitstring.BitStream(bits)
+        import bitstring
+        bits = bitstring.BitArray(bits)
         while not bits[-1]:
             del bits[-1]
         del bits[-1]
@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# huffman_cache.py
+
+"""Cache of built HuffmanCode objects, for compressing many blocks
+whose frequency tables are the same or nearly so.
+
+A HuffmanCodeCache maps the fingerprint of a frequency table (the
+table quantised to a fixed number of levels) to the HuffmanCode built
+from the first table with that fingerprint, so near-identical tables
+share one code instead of each rebuilding the heap and the tree.
+Optionally, a table whose fingerprint misses may still be given any
+cached code that would encode it with an estimated size penalty below
+a threshold. Entries are evicted least recently used first, to keep
+the estimated memory held below a bound.
+
+Every HuffmanCode holds a codeword for all 256 byte values (even
+those with frequency 0), so any cached code can encode any block; a
+looser match only costs compression ratio.
+"""
+
+from array import array
+from collections import OrderedDict
+import math
+import sys
+
+from .huffman import HuffmanCode
+
+SYMBOLS = [i.to_bytes(1, 'big') for i in range(256)]
+
+
+class HuffmanCodeCache:
+    """LRU cache of HuffmanCode objects keyed by frequency table
+    fingerprint.
+
+    hits: lookups answered by a code with the same fingerprint.
+    nearHits: lookups answered by a code with another fingerprint,
+        within maxPenalty (see get).
+    misses: lookups that built a new code.
+    nbytes: estimated memory held by the cached entries.
+    """
+
+    def __init__(self, maxBytes=8 << 20, levels=4096, maxPenalty=None):
+        """Create an empty cache holding at most (an estimated) maxBytes
+        of codes. Frequencies are quantised to multiples of 1/levels
+        (at most 65535 levels) when fingerprinting. maxPenalty, if not
+        None, enables reuse of codes with another fingerprint (see
+        get).
+        """
+        if not 0 < levels < 1 << 16:
+            raise ValueError("levels must be between 1 and 65535")
+        self.maxBytes = maxBytes
+        self.levels = levels
+        self.maxPenalty = maxPenalty
+        self.hits = 0
+        self.nearHits = 0
+        self.misses = 0
+        self.nbytes = 0
+        # fingerprint -> (code, codeword lengths by byte value, size)
+        self._entries = OrderedDict()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def fingerprint(self, frequencyTable):
+        """Return the fingerprint of a frequency table (as made by
+        HuffmanCode.occurrences2frequencies): a bytes object holding
+        each frequency rounded to a multiple of 1/levels, in byte
+        value order. Tables with equal fingerprints share a code.
+        """
+        levels = self.levels
+        return array('H', (round(frequencyTable.get(s, 0) * levels)
+                           for s in SYMBOLS)).tobytes()
+
+    def get(self, frequencyTable):
+        """Return a HuffmanCode for frequencyTable: the cached one with
+        the same fingerprint if there is one, and otherwise a new one,
+        which is cached.
+
+        If maxPenalty is not None, before building a new code, look
+        for a cached code whose expected codeword length for this
+        table is within a factor (1 + maxPenalty) of the table's
+        entropy, and return the best such code instead. The entropy
+        is a lower bound for any code, so the penalty is
+        overestimated, never under.
+        """
+        key = self.fingerprint(frequencyTable)
+        entry = self._entries.get(key)
+        if entry is not None:
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return entry[0]
+
+        if self.maxPenalty is not None and self._entries:
+            frequencies = [frequencyTable.get(s, 0) for s in SYMBOLS]
+            entropy = -sum(f * math.log2(f) for f in frequencies if f > 0)
+            bestKey, bestLength = None, (1 + self.maxPenalty) * entropy
+            for cachedKey, (_, lengths, _) in self._entries.items():
+                length = sum(f * n for f, n in zip(frequencies, lengths))
+                if length <= bestLength:
+                    bestKey, bestLength = cachedKey, length
+            if bestKey is not None:
+                self.nearHits += 1
+                self._entries.move_to_end(bestKey)
+                return self._entries[bestKey][0]
+
+        self.misses += 1
+        code = HuffmanCode(frequencyTable)
+        self.put(key, code)
+        return code
+
+    def put(self, key, code):
+        """Cache code under the fingerprint key, evicting the least
+        recently used entries as needed to stay within maxBytes. A
+        code bigger than maxBytes on its own is not cached.
+        """
+        lengths = codewordLengths(code)
+        size = len(key) + lengths.itemsize * len(lengths) + treeSize(code.tree)
+        if size > self.maxBytes:
+            return
+        if key in self._entries:
+            self.nbytes -= self._entries.pop(key)[2]
+        self._entries[key] = (code, lengths, size)
+        self.nbytes += size
+        while self.nbytes > self.maxBytes:
+            _, (_, _, evicted) = self._entries.popitem(last=False)
+            self.nbytes -= evicted
+
+
+def codewordLengths(code):
+    """Return an array with the codeword length, in bits, of each byte
+    value under code."""
+    lengths = array('B', bytes(256))
+    stack = [(code.tree, 0)]
+    while stack:
+        t, depth = stack.pop()
+        if t.isSingleton():
+            lengths[int.from_bytes(t.leaf, 'big')] = depth
+        else:
+            stack.append((t.left, depth + 1))
+            stack.append((t.right, depth + 1))
+    return lengths
+
+def treeSize(tree):
+    """Return an estimate, in bytes, of the memory held by a PrefixTree
+    (its nodes, their attribute dictionaries and their leaves)."""
+    size = 0
+    stack = [tree]
+    while stack:
+        t = stack.pop()
+        size += sys.getsizeof(t) + sys.getsizeof(t.__dict__) + sys.getsizeof(t.root)
+        if t.isSingleton():
+            size += sys.getsizeof(t.leaf)
+        else:
+            stack.append(t.left)
+            stack.append(t.right)
+    return size
@@ -0,0 +1,90 @@
+class CycleError(ValueError):
+    # Raised by IncrementalDAG.add_edge for an edge that would close a
+    # cycle; the cycle's vertices, in edge order, are in self.cycle.
+    def __init__(self, cycle):
+        super().__init__(f"edge would create the cycle {cycle}")
+        self.cycle = cycle
+
+
+class IncrementalDAG:
+    # A DAG that keeps a topological order of its vertices as edges are
+    # inserted, rejecting any edge that would create a cycle
+    # (Pearce-Kelly dynamic topological sort).
+    #
+    # Every vertex has a position ord[v] in the order, and at[p] is the
+    # vertex at position p. An edge x->y with ord[x] < ord[y] costs
+    # nothing. Otherwise only the vertices with positions between
+    # ord[y] and ord[x] can be affected: a forward search from y and a
+    # backward search from x, both confined to that range, find them
+    # (reaching x from y means the edge closes a cycle), and the
+    # positions they already occupy are dealt out again so that the
+    # backward set comes before the forward one.
+    def __init__(self, g=None):
+        self.succ = {}
+        self.pred = {}
+        self.ord = {}
+        self.at = []
+        for v in g or ():
+            self.add_vertex(v)
+        for v in g or ():
+            for w in g[v] or ():
+                self.add_edge(v, w)
+
+    def add_vertex(self, v):
+        if v not in self.ord:
+            self.succ[v] = set()
+            self.pred[v] = set()
+            self.ord[v] = len(self.at)
+            self.at.append(v)
+
+    def add_edge(self, x, y):
+        self.add_vertex(x)
+        self.add_vertex(y)
+        if y in self.succ[x]:
+            return
+        if x == y:
+            raise CycleError([x])
+        lb, ub = self.ord[y], self.ord[x]
+        if lb < ub:
+            forward = self._search(y, self.succ, lambda w: self.ord[w] <= ub, x)
+            backward = self._search(x, self.pred, lambda w: self.ord[w] >= lb)
+            self._reorder(backward, forward)
+        self.succ[x].add(y)
+        self.pred[y].add(x)
+
+    def remove_edge(self, x, y):
+        # Removing edges never invalidates the order
+        self.succ[x].discard(y)
+        self.pred[y].discard(x)
+
+    def order(self):
+        return list(self.at)
+
+    def _search(self, start, edges, inside, target=None):
+        # Iterative DFS from start along edges, visiting only the
+        # vertices for which inside() holds. Returns the visited
+        # vertices, or raises CycleError if target is reached.
+        parent = {start: None}
+        stack = [start]
+        while stack:
+            v = stack.pop()
+            for w in edges[v]:
+                if w == target:
+                    cycle = [v]
+                    while parent[cycle[-1]] is not None:
+                        cycle.append(parent[cycle[-1]])
+                    cycle.reverse()
+                    raise CycleError(cycle + [target])
+                if w not in parent and inside(w):
+                    parent[w] = v
+                    stack.append(w)
+        return list(parent)
+
+    def _reorder(self, backward, forward):
+        key = self.ord.__getitem__
+        backward.sort(key=key)
+        forward.sort(key=key)
+        vertices = backward + forward
+        for v, p in zip(vertices, sorted(map(key, vertices))):
+            self.ord[v] = p
+            self.at[p] = v
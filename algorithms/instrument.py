@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# instrument.py
+
+"""Opt-in counters and timers for the hot paths of the algorithms.
+
+Instrumentation is off unless enable() is called (or the
+ALGORITHMS_INSTRUMENT environment variable is set). The algorithms
+never call into this module from their inner loops: where possible
+the figures are derived once per call from state the loop keeps
+anyway (the number of vertices a BFS reached is the length of its
+queue), and the few that cannot be are plain local additions. Either
+way they are handed over at the end of the call, guarded by
+`if instrument.enabled:`, so the cost when disabled is one attribute
+check per call.
+
+Counters: name -> total. Timers: name -> (calls, seconds), for the
+functions decorated with timed(). Results can be exported as JSON,
+or as a file in the format written by cProfile, which pstats (and
+tools built on it, like snakeviz) can read: every timer becomes a
+"function" with its calls and time, and every counter one whose call
+count is the counter's value.
+
+    from algorithms import instrument
+    instrument.enable()
+    ...
+    instrument.dumpJson('run.json')
+    instrument.dumpStats('run.prof')   # python -m pstats run.prof
+"""
+
+import functools
+import os
+import time
+
+enabled = bool(os.environ.get('ALGORITHMS_INSTRUMENT'))
+counters = {}
+timers = {}
+
+
+def enable():
+    """Start collecting."""
+    global enabled
+    enabled = True
+
+
+def disable():
+    """Stop collecting (what has been collected is kept)."""
+    global enabled
+    enabled = False
+
+
+def reset():
+    """Forget everything collected so far."""
+    counters.clear()
+    timers.clear()
+
+
+def add(name, n=1):
+    """Add n to the counter name. Callers check enabled first."""
+    counters[name] = counters.get(name, 0) + n
+
+
+def timed(name):
+    """Decorator: time every call of the function under name while
+    instrumentation is enabled."""
+    def decorate(f):
+        @functools.wraps(f)
+        def wrapper(*args, **kwargs):
+            if not enabled:
+                return f(*args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return f(*args, **kwargs)
+            finally:
+                calls, seconds = timers.get(name, (0, 0.0))
+                timers[name] = (calls + 1, seconds + time.perf_counter() - start)
+        return wrapper
+    return decorate
+
+
+def report():
+    """Return everything collected, as a dictionary (suitable for
+    JSON)."""
+    return {
+        'counters': dict(counters),
+        'timers': {name: {'calls': calls, 'seconds': seconds}
+                   for name, (calls, seconds) in timers.items()},
+    }
+
+
+def dumpJson(path):
+    """Write report() to path as JSON."""
+    # Imported here, as every algorithm imports this module
+    import json
+    with open(path, 'w') as f:
+        json.dump(report(), f, indent=2)
+        f.write('\n')
+
+
+def dumpStats(path):
+    """Write the timers and counters to path in cProfile's format, for
+    pstats.Stats(path)."""
+    import marshal
+    stats = {}
+    for name, (calls, seconds) in timers.items():
+        stats[('<timer>', 0, name)] = (calls, calls, seconds, seconds, {})
+    for name, value in counters.items():
+        stats[('<counter>', 0, name)] = (value, value, 0.0, 0.0, {})
+    with open(path, 'wb') as f:
+        marshal.dump(stats, f)
@@ -0,0 +1,94 @@
+from array import array
+import os
+
+from . import worker_pool
+from .bf_cycle import bf
+from .sssp import dijkstra_csr
+
+
+class DistanceMatrix:
+    # All-pairs distances, stored row-major in one flat array of doubles
+    # rather than a dict of dicts: data[i*n + j] is the distance from
+    # vertices[i] to vertices[j] (inf if there is no path).
+    def __init__(self, vertices, data):
+        self.vertices = vertices
+        self.index = {v: i for i, v in enumerate(vertices)}
+        self.data = data
+
+    def __getitem__(self, uv):
+        u, v = uv
+        return self.data[self.index[u] * len(self.vertices) + self.index[v]]
+
+    def row(self, u):
+        n = len(self.vertices)
+        i = self.index[u] * n
+        return dict(zip(self.vertices, self.data[i:i + n]))
+
+
+def johnson(g, workers=None):
+    # Johnson's all-pairs shortest paths for g in the same format as bf
+    # (every vertex a key, mapping to a dict {neighbour: weight}).
+    # Returns (DistanceMatrix, None), or (None, cycle) if g has a
+    # negative cycle.
+    #
+    # One Bellman-Ford run from a virtual source joined to every vertex
+    # by a 0-weight edge gives potentials h with w(u,v) + h[u] - h[v] >= 0
+    # on every edge, so each source can then use Dijkstra; the
+    # per-source runs are spread over a process pool.
+    source = object()
+    augmented = dict(g)
+    augmented[source] = {v: 0 for v in g}
+    h, cycle = bf(augmented, source)
+    if cycle is not None:
+        return (None, cycle)
+
+    vertices = list(g)
+    n = len(vertices)
+    index = {v: i for i, v in enumerate(vertices)}
+    potentials = array('d', (h[v] for v in vertices))
+
+    # Reweighted graph in compressed sparse row form: the edges out of
+    # vertex i are targets/weights[offsets[i]:offsets[i+1]]
+    offsets, targets, weights = array('q', [0]), array('q'), array('d')
+    for u in vertices:
+        for v, c in g[u].items():
+            targets.append(index[v])
+            # Clamp rounding errors, which could make a weight -1e-17
+            weights.append(max(0.0, c + h[u] - h[v]))
+        offsets.append(len(targets))
+
+    data = array('d', bytes(8 * n * n))
+    workers = workers or os.cpu_count() or 1
+    block = max(1, -(-n // (4 * workers)))
+    blocks = [(i, min(i + block, n)) for i in range(0, n, block)]
+    csr = (offsets, targets, weights, potentials)
+    if workers == 1 or len(blocks) == 1:
+        for start, end in blocks:
+            data[start * n:end * n] = _rows((start, end), csr)
+    else:
+        with worker_pool.pool(workers, csr) as pool:
+            for (start, end), rows in zip(blocks, pool.map(_rows, blocks)):
+                data[start * n:end * n] = rows
+
+    return (DistanceMatrix(vertices, data), None)
+
+
+def _rows(sources, csr=None):
+    # Distance rows for the sources in range(*sources), as one flat
+    # array; in a worker the graph is the one it was started with
+    offsets, targets, weights, potentials = csr or worker_pool.shared()
+    rows = array('d')
+    for s in range(*sources):
+        dist = dijkstra_csr(offsets, targets, weights, s)
+        # Undo the reweighting: d(s,v) = d'(s,v) - h[s] + h[v]
+        hs = potentials[s]
+        rows.extend(d - hs + hv for d, hv in zip(dist, potentials))
+    return rows
+
+
+if __name__ == '__main__':
+    graph = {'a': {'b': 3, 'c': -2}, 'b': {'a': 4}, 'c': {'b': 1}}
+
+    matrix, cycle = johnson(graph)
+    for v in matrix.vertices:
+        print(v, matrix.row(v))
@@ -0,0 +1,94 @@
+from array import array
+
+from . import instrument
+from .bfs_engine import bfs
+from .csr import CSRGraph
+
+@instrument.timed('compute_max_flow')
+def compute_max_flow(capacity, s, t):
+    # Maximum flow from s to t: capacity maps each edge (u, v) to its
+    # capacity, or is a CSRGraph whose weights are the capacities.
+    # Returns (flow, flows, min_cut): the value of the flow out of s,
+    # the flow on every edge keyed by (u, v), and the vertices on the s
+    # side of a minimum cut.
+    if not isinstance(capacity, CSRGraph):
+        capacity = CSRGraph.from_capacities(capacity)
+    return compute_max_flow_csr(capacity, s, t)
+
+def compute_max_flow_csr(g, s, t):
+    # compute_max_flow on a CSRGraph: Edmonds-Karp on its arrays, with
+    # the shortest augmenting paths found by bfs_engine.bfs. The
+    # residual graph is packed CSR-style once and never rebuilt: every
+    # edge of g gets a forward residual edge out of its tail and a
+    # reverse one out of its head, rev pairs them up, and residual[j] is
+    # the capacity left on residual edge j, so antiparallel edges keep
+    # separate residual edges.
+    n = len(g)
+    offsets, targets, capacities = g.offsets, g.targets, g.weights
+    labels = g.labels
+    if s not in g.index:
+        return 0, {(labels[u], labels[targets[i]]): 0 for u in range(n)
+                   for i in range(offsets[u], offsets[u + 1])}, [s]
+    m = len(targets)
+    # Integer capacities keep integer flows
+    typecode = 'd' if m and isinstance(capacities[0], float) else 'q'
+    out_offsets = array('q', [0]) * (n + 1)
+    for u in range(n):
+        for i in range(offsets[u], offsets[u + 1]):
+            out_offsets[u + 1] += 1
+            out_offsets[targets[i] + 1] += 1
+    for u in range(n):
+        out_offsets[u + 1] += out_offsets[u]
+    out_targets = array('q', [0]) * (2 * m)
+    residual = array(typecode, [0]) * (2 * m)
+    rev = array('q', [0]) * (2 * m)
+    forward = array('q', [0]) * m  # edge i's forward residual edge
+    free = out_offsets[:-1]
+    for u in range(n):
+        for i in range(offsets[u], offsets[u + 1]):
+            v = targets[i]
+            j = free[u]
+            free[u] += 1
+            k = free[v]
+            free[v] += 1
+            out_targets[j], out_targets[k] = v, u
+            residual[j] = capacities[i]
+            rev[j], rev[k] = k, j
+            forward[i] = j
+
+    source, sink = g.index[s], g.index.get(t, -1)
+    augmentations = visits = 0
+    while True:
+        dist, reached_by, order = bfs(out_offsets, out_targets, source, sink,
+                                      via=True, residual=residual)
+        visits += len(order)
+        if sink < 0 or dist[sink] < 0:
+            # The vertices we visited from s form a min cut
+            break
+        augmentations += 1
+        path = []
+        v = sink
+        while v != source:
+            j = reached_by[v]
+            path.append(j)
+            v = out_targets[rev[j]]
+        delta = min(residual[j] for j in path)
+        for j in path:
+            residual[j] -= delta
+            residual[rev[j]] += delta
+
+    # The flow on edge i is what its reverse residual edge has gained
+    flows = {}
+    total_flow = 0
+    for u in range(n):
+        for i in range(offsets[u], offsets[u + 1]):
+            flow = residual[rev[forward[i]]]
+            flows[(labels[u], labels[targets[i]])] = flow
+            if u == source:
+                total_flow += flow
+            if targets[i] == source:
+                total_flow -= flow
+    if instrument.enabled:
+        instrument.add('maxflow.augmentations', augmentations)
+        instrument.add('maxflow.bfsVisits', visits)
+    return total_flow, flows, [labels[v] for v in order]
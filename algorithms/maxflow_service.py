@@ -0,0 +1,266 @@
+import argparse
+import asyncio
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+import json
+import os
+import shutil
+import sys
+import tempfile
+
+from . import csr_file
+from .maxflow import compute_max_flow
+
+# A local max flow service, so that clients do not pay for starting
+# Python and parsing a network on every query.
+#
+# Requests and responses are JSON objects, one per line, over a Unix
+# socket (--socket) or stdin/stdout. Every request may carry an "id",
+# which is copied into its response; responses can come back out of
+# order, as queries run concurrently.
+#
+#   {"op": "load", "name": N, "path": P}
+#       Load the network in P (a flownetwork_*.csv edge list, or a
+#       .csr file from csr_file.py) as N, replacing any network of that
+#       name. Responds {"version", "vertices", "edges"}; the version
+#       goes up every time N is loaded.
+#   {"op": "maxflow", "name": N, "s": S, "t": T, "flows": false}
+#       Max flow from S to T in N. Responds {"flow", "min_cut",
+#       "cached"} and, if "flows" is true, "flows" as [u, v, flow]
+#       triples.
+#   {"op": "stats"}
+#       Responds {"networks", "hits", "misses", "cached"}.
+#
+# Every response has "ok": true, or "ok": false and an "error" message.
+#
+# A network is parsed once, when it is loaded, and written to a
+# snapshot .csr file private to the service, named by the network's
+# version. The worker processes that run the queries map the snapshot
+# (csr_file.load) the first time they get a query on that version, so
+# the event loop never blocks on a computation, and every query on a
+# version sees exactly the network that was loaded, whatever happens to
+# the original file afterwards. A snapshot is deleted once its version
+# has been replaced and no query on it is still running. Results are
+# cached by (name, version, s, t); a query that arrives while the same
+# one is running waits for it rather than starting another, and queries
+# on a network that is being loaded wait for the load.
+
+
+def load_network(path):
+    if path.endswith('.csr'):
+        return csr_file.load(path)
+    return csr_file.from_csv(path)
+
+def snapshot_network(path, snapshot):
+    # Parse the network in path once and save it to snapshot; returns it
+    g = load_network(path)
+    csr_file.save(g, snapshot)
+    return g
+
+# Networks resident in a worker process, by (name, version)
+_networks = {}
+
+def _solve(name, version, snapshot, s, t):
+    g = _networks.get((name, version))
+    if g is None:
+        # Older versions of the network will not be asked for again
+        for key in [key for key in _networks if key[0] == name]:
+            del _networks[key]
+        g = _networks[(name, version)] = csr_file.load(snapshot)
+    flow, flows, min_cut = compute_max_flow(g, s, t)
+    return flow, min_cut, [[u, v, f] for (u, v), f in flows.items()]
+
+class MaxFlowService:
+    def __init__(self, workers=None, cache_size=4096):
+        self.pool = ProcessPoolExecutor(workers)
+        self.networks = {}  # name -> (version, snapshot)
+        self.versions = {}
+        self.snapshots = tempfile.mkdtemp(prefix='maxflow-service-')
+        self.snapshot_count = 0
+        self.running = {}  # snapshot -> number of queries running on it
+        self.retired = set()  # snapshots of replaced versions
+        self.loading = {}  # name -> task loading it
+        self.cache_size = cache_size
+        self.results = OrderedDict()  # (name, version, s, t) -> future
+        self.hits = 0
+        self.misses = 0
+
+    async def handle(self, request):
+        try:
+            op = request.get('op')
+            if op == 'load':
+                response = await self.load(request['name'], request['path'])
+            elif op == 'maxflow':
+                response = await self.max_flow(request['name'], request['s'],
+                                               request['t'], request.get('flows', False))
+            elif op == 'stats':
+                response = {'networks': {name: version for name, (version, _)
+                                         in self.networks.items()},
+                            'hits': self.hits, 'misses': self.misses,
+                            'cached': len(self.results)}
+            else:
+                raise ValueError(f"unknown op {op!r}")
+            response['ok'] = True
+        except Exception as e:
+            response = {'ok': False, 'error': f"{type(e).__name__}: {e}"}
+        if 'id' in request:
+            response['id'] = request['id']
+        return response
+
+    def close(self):
+        self.pool.shutdown()
+        shutil.rmtree(self.snapshots, ignore_errors=True)
+
+    async def load(self, name, path):
+        # The version is taken up front, so that it names the snapshot
+        version = self.versions[name] = self.versions.get(name, 0) + 1
+        # (names are not safe as file names, so snapshots are numbered)
+        self.snapshot_count += 1
+        snapshot = os.path.join(self.snapshots,
+                                f"{self.snapshot_count}-v{version}.csr")
+        self.running[snapshot] = 0
+        # Queries on name that arrive while it loads wait for it
+        loading = self.loading[name] = asyncio.ensure_future(
+            asyncio.to_thread(snapshot_network, path, snapshot))
+        try:
+            g = await loading
+        except Exception:
+            self.retire(snapshot)
+            raise
+        finally:
+            if self.loading.get(name) is loading:
+                del self.loading[name]
+        if name in self.networks and self.networks[name][0] > version:
+            # A later load of name finished first
+            self.retire(snapshot)
+            return {'version': version, 'vertices': len(g), 'edges': g.edge_count()}
+        if name in self.networks:
+            self.retire(self.networks[name][1])
+        self.networks[name] = (version, snapshot)
+        # Results for older versions can never be hit again
+        for key in [key for key in self.results if key[0] == name]:
+            del self.results[key]
+        return {'version': version, 'vertices': len(g), 'edges': g.edge_count()}
+
+    async def max_flow(self, name, s, t, with_flows):
+        if name in self.loading:
+            await asyncio.wait([self.loading[name]])
+        if name not in self.networks:
+            raise KeyError(f"no network called {name!r}")
+        version, snapshot = self.networks[name]
+        key = (name, version, s, t)
+        cached = key in self.results
+        if cached:
+            self.hits += 1
+            self.results.move_to_end(key)
+            future = self.results[key]
+        else:
+            self.misses += 1
+            future = asyncio.get_running_loop().run_in_executor(
+                self.pool, _solve, name, version, snapshot, s, t)
+            self.running[snapshot] += 1
+            future.add_done_callback(lambda _: self.finished(snapshot))
+            self.results[key] = future
+            while len(self.results) > self.cache_size:
+                self.results.popitem(last=False)
+        try:
+            flow, min_cut, flows = await asyncio.shield(future)
+        except Exception:
+            if self.results.get(key) is future:
+                del self.results[key]
+            raise
+        response = {'flow': flow, 'min_cut': min_cut, 'cached': cached}
+        if with_flows:
+            response['flows'] = flows
+        return response
+
+    def retire(self, snapshot):
+        # snapshot's version has been replaced: delete it once nothing
+        # runs on it
+        self.retired.add(snapshot)
+        self.finished(snapshot, 0)
+
+    def finished(self, snapshot, queries=1):
+        self.running[snapshot] -= queries
+        if snapshot in self.retired and not self.running[snapshot]:
+            self.retired.discard(snapshot)
+            del self.running[snapshot]
+            try:
+                os.remove(snapshot)
+            except FileNotFoundError:
+                pass
+
+    async def serve_lines(self, reader, write):
+        # Answer the requests read from reader concurrently, passing each
+        # response line to write
+        tasks = set()
+        async def answer(line):
+            try:
+                request = json.loads(line)
+                if not isinstance(request, dict):
+                    raise ValueError("a request must be a JSON object")
+            except ValueError as e:
+                response = {'ok': False, 'error': f"bad request: {e}"}
+            else:
+                response = await self.handle(request)
+            await write(json.dumps(response) + '\n')
+        while line := await reader.readline():
+            if line.strip():
+                task = asyncio.create_task(answer(line))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+        if tasks:
+            await asyncio.wait(tasks)
+
+    async def serve_socket(self, path):
+        async def client(reader, writer):
+            async def write(line):
+                writer.write(line.encode())
+                await writer.drain()
+            try:
+                await self.serve_lines(reader, write)
+            finally:
+                writer.close()
+        server = await asyncio.start_unix_server(client, path)
+        async with server:
+            await server.serve_forever()
+
+    async def serve_stdio(self):
+        loop = asyncio.get_running_loop()
+        reader = asyncio.StreamReader(limit=1 << 24)
+        await loop.connect_read_pipe(lambda: asyncio.StreamReaderProtocol(reader),
+                                     sys.stdin)
+        async def write(line):
+            sys.stdout.write(line)
+            sys.stdout.flush()
+        await self.serve_lines(reader, write)
+
+
+async def main():
+    parser = argparse.ArgumentParser(description='Max flow query service')
+    parser.add_argument('--socket', help='Unix socket to listen on '
+                        '(default: serve stdin/stdout)')
+    parser.add_argument('--workers', type=int, help='worker processes')
+    parser.add_argument('--cache-size', type=int, default=4096,
+                        help='results to cache')
+    parser.add_argument('--load', nargs=2, action='append', default=[],
+                        metavar=('NAME', 'PATH'), help='load a network at startup')
+    args = parser.parse_args()
+
+    service = MaxFlowService(args.workers, args.cache_size)
+    try:
+        for name, path in args.load:
+            await service.load(name, path)
+        if args.socket:
+            await service.serve_socket(args.socket)
+        else:
+            await service.serve_stdio()
+    finally:
+        service.close()
+
+
+if __name__ == '__main__':
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,124 @@
+from array import array
+from heapq import heappop, heappush
+
+from .bf_cycle import bf
+from .csr import CSRGraph
+
+# Integer weights up to this use the bucket queue by default: on
+# bench_sssp.py's graphs it beats the heap up to a few thousand
+BUCKET_LIMIT = 1024
+
+
+def shortest_distances(g, s, unbounded=False, queue=None):
+    # Single-source shortest paths from s, in the same format and with
+    # the same (distances, cycle) result as bf (g may be a dict of dicts
+    # or a CSRGraph). The weights are scanned once: if any is negative
+    # this is bf(g, s, unbounded), otherwise Dijkstra, whose cycle is
+    # always None. queue picks Dijkstra's priority queue: 'heap' for a
+    # binary heap, or 'buckets' for a bucket queue (Dial's algorithm),
+    # which needs integer weights; by default buckets are used when every
+    # weight is an int no bigger than BUCKET_LIMIT.
+    if isinstance(g, CSRGraph):
+        weights = g.weights
+        lowest = min(weights, default=0)
+        highest = max(weights, default=0)
+        integral = all(type(c) is int for c in weights[:1])
+    else:
+        lowest, highest, integral = 0, 0, True
+        for edges in g.values():
+            for c in edges.values():
+                if c < lowest:
+                    lowest = c
+                elif c > highest:
+                    highest = c
+                if integral and type(c) is not int:
+                    integral = False
+    if lowest < 0:
+        return bf(g, s, unbounded)
+
+    if queue is None:
+        queue = 'buckets' if integral and highest <= BUCKET_LIMIT else 'heap'
+    if queue not in ('heap', 'buckets'):
+        raise ValueError(f"unknown queue {queue!r}")
+    if queue == 'buckets' and not integral:
+        raise ValueError("a bucket queue needs integer weights")
+
+    if isinstance(g, CSRGraph):
+        # Distances are summed from the weights themselves, as in bf, so
+        # integer weights give integer distances
+        source = g.index[s]
+        dist = [float('inf')] * len(g)
+        if queue == 'heap':
+            dist = dijkstra(dist, g.edges, source)
+        else:
+            dist = dial(dist, g.edges, source, highest)
+        return (dict(zip(g.labels, dist)), None)
+    dist = {v: float('inf') for v in g}
+    edges_of = lambda u: g[u].items()
+    if queue == 'heap':
+        return (dijkstra(dist, edges_of, s), None)
+    return (dial(dist, edges_of, s, highest), None)
+
+def dijkstra(dist, edges_of, s):
+    # Dijkstra with a binary heap. dist maps every vertex to inf and is
+    # filled in and returned; edges_of(u) gives the (v, weight) pairs of
+    # the edges out of u, with no weight negative.
+    dist[s] = 0
+    heap = [(0, s)]
+    while heap:
+        d, u = heappop(heap)
+        if d > dist[u]:
+            continue
+        for v, c in edges_of(u):
+            if d + c < dist[v]:
+                dist[v] = d + c
+                heappush(heap, (d + c, v))
+    return dist
+
+def dijkstra_csr(offsets, targets, weights, s):
+    # Dijkstra with a binary heap on a CSR graph with non-negative
+    # weights; returns an array of distances from s indexed like the
+    # vertices (inf where unreachable)
+    dist = array('d', [float('inf')]) * (len(offsets) - 1)
+    dist[s] = 0.0
+    heap = [(0.0, s)]
+    while heap:
+        d, u = heappop(heap)
+        if d > dist[u]:
+            continue
+        for i in range(offsets[u], offsets[u + 1]):
+            v = targets[i]
+            nd = d + weights[i]
+            if nd < dist[v]:
+                dist[v] = nd
+                heappush(heap, (nd, v))
+    return dist
+
+def dial(dist, edges_of, s, max_weight):
+    # Like dijkstra, with integer weights of at most max_weight and a
+    # bucket queue instead of the heap. Every vertex waiting to be
+    # settled is within max_weight of the distance d being settled, so
+    # max_weight+1 buckets used cyclically, bucket i holding the vertices
+    # at distances congruent to i, are enough. Vertices are not moved
+    # between buckets when their distance drops, just added again; the
+    # stale entries are skipped. O(E + largest distance).
+    size = max_weight + 1
+    buckets = [[] for _ in range(size)]
+    dist[s] = 0
+    buckets[0].append(s)
+    waiting = 1
+    d = 0
+    while waiting:
+        bucket = buckets[d % size]
+        while bucket:
+            u = bucket.pop()
+            waiting -= 1
+            if dist[u] != d:
+                continue
+            for v, c in edges_of(u):
+                if d + c < dist[v]:
+                    dist[v] = d + c
+                    buckets[(d + c) % size].append(v)
+                    waiting += 1
+        d += 1
+    return dist
@@ -0,0 +1,25 @@
+# Process pools whose tasks all read the same large arguments (a packed
+# graph, say). Each worker receives them once, when it starts, instead
+# of with every task, and its tasks read them back with shared().
+#
+#     with worker_pool.pool(workers, (offsets, targets)) as pool:
+#         pool.map(task, sources)
+#
+# where task calls worker_pool.shared() to get (offsets, targets).
+
+_shared = None
+
+def _init(shared):
+    global _shared
+    _shared = shared
+
+def pool(workers, shared):
+    # A ProcessPoolExecutor with the given number of workers, each
+    # started with shared. concurrent.futures is imported here, as it
+    # takes longer to import than the modules that use it
+    from concurrent.futures import ProcessPoolExecutor
+    return ProcessPoolExecutor(workers, initializer=_init, initargs=(shared,))
+
+def shared():
+    # In a worker of pool(), what the pool was started with
+    return _shared
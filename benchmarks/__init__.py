@@ -0,0 +1,6 @@
+# -*- coding: utf-8 -*-
+# __init__.py
+
+"""Benchmarks for the algorithms package. Run them from the top of the
+repository as modules, e.g. python3 -m benchmarks.bench_suite.
+"""
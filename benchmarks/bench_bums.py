@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# bench_bums.py
+
+"""Benchmark bums.Sorter over a sweep of input sizes and distributions.
+
+For every (distribution, size) point, the array is sorted once by a
+plain bums.Sorter, to measure wall-clock time without any
+instrumentation overhead, and once by a bums_stats.InstrumentedSorter,
+to count comparisons and moves, measure scratch usage and time each
+pass. Results are written as CSV (one row per point) or JSON.
+
+Comparison and move counts are deterministic for a given seed, so
+they can be checked against a baseline file saved from an earlier
+run (with --format json); any point whose counts went up is reported
+and the script exits with status 1.
+
+Usage: python3 -m benchmarks.bench_bums [-n 1000 10000 ...] [-d random sorted ...]
+           [--format csv|json] [-o FILE] [--baseline FILE] [--seed S]
+"""
+
+import argparse
+import csv
+import json
+import random
+import sys
+import time
+
+from algorithms import bums, bums_stats
+from benchmarks.generators import to_fsa
+
+
+def randomValues(n, rng):
+    return [rng.random() for _ in range(n)]
+
+
+def sortedValues(n, rng):
+    return list(range(n))
+
+
+def reversedValues(n, rng):
+    return list(range(n, 0, -1))
+
+
+def nearlySortedValues(n, rng):
+    values = list(range(n))
+    for _ in range(max(1, n // 100)):
+        i, j = rng.randrange(n), rng.randrange(n)
+        values[i], values[j] = values[j], values[i]
+    return values
+
+
+def fewUniqueValues(n, rng):
+    return [rng.randrange(8) for _ in range(n)]
+
+
+DISTRIBUTIONS = {
+    'random': randomValues,
+    'sorted': sortedValues,
+    'reversed': reversedValues,
+    'nearly-sorted': nearlySortedValues,
+    'few-unique': fewUniqueValues,
+}
+
+COUNTERS = ('comparisons', 'moves', 'scratchHighWater')
+
+
+def measure(values):
+    """Sort values with and without instrumentation and return a
+    dictionary with the wall time and the InstrumentedSorter stats."""
+    sorter = bums.Sorter(to_fsa(values))
+    start = time.perf_counter()
+    sorter.sort()
+    seconds = time.perf_counter() - start
+
+    instrumented = bums_stats.InstrumentedSorter(to_fsa(values))
+    instrumented.sort()
+    result = instrumented.stats.asDict()
+    result['seconds'] = seconds
+    return result
+
+
+def regressions(results, baseline):
+    """Return a list of messages, one for each counter of each point in
+    results that is higher than the same counter in baseline."""
+    old = {(r['distribution'], r['n']): r for r in baseline}
+    messages = []
+    for r in results:
+        b = old.get((r['distribution'], r['n']))
+        if b is None:
+            continue
+        for counter in COUNTERS:
+            if r[counter] > b[counter]:
+                messages.append(f"{r['distribution']} n={r['n']}: {counter} "
+                                f"{b[counter]} -> {r[counter]}")
+    return messages
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('-n', type=int, nargs='+',
+                        default=[1000, 10_000, 100_000], help='array sizes')
+    parser.add_argument('-d', nargs='+', choices=DISTRIBUTIONS,
+                        default=list(DISTRIBUTIONS), help='distributions')
+    parser.add_argument('--format', choices=('csv', 'json'), default='csv')
+    parser.add_argument('-o', help='output file (default: stdout)')
+    parser.add_argument('--baseline', help='JSON results to compare against')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    results = []
+    for name in args.d:
+        for n in args.n:
+            values = DISTRIBUTIONS[name](n, random.Random(args.seed))
+            result = {'distribution': name, 'n': n}
+            result.update(measure(values))
+            results.append(result)
+
+    out = open(args.o, 'w', newline='') if args.o else sys.stdout
+    try:
+        if args.format == 'json':
+            json.dump(results, out, indent=2)
+            out.write('\n')
+        else:
+            writer = csv.writer(out)
+            writer.writerow(['distribution', 'n', 'seconds', *COUNTERS,
+                             'passTimes'])
+            for r in results:
+                writer.writerow([r['distribution'], r['n'],
+                                 f"{r['seconds']:.6f}",
+                                 *(r[c] for c in COUNTERS),
+                                 ' '.join(f"{c}:{t:.6f}"
+                                          for c, t in r['passTimes'])])
+    finally:
+        if args.o:
+            out.close()
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            messages = regressions(results, json.load(f))
+        for message in messages:
+            print('REGRESSION', message, file=sys.stderr)
+        if messages:
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# bench_import.py
+
+"""Import-time benchmark for the algorithms package: import every
+module of the package in a fresh interpreter and report how long the
+import took (the best of --repeat runs, not counting interpreter
+startup), whether it wrote anything, and which of the heavy optional
+dependencies (bitstring, numpy) it pulled in.
+
+Importing a module should do nothing but define things, so any output
+is reported as an error and the script exits with status 1; so is a
+heavy dependency imported by a module not listed in NEEDS_HEAVY.
+
+Usage: python3 -m benchmarks.bench_import [-m huffman maxflow ...]
+           [--repeat R] [--json]
+"""
+
+import argparse
+import json
+import os
+import pkgutil
+import subprocess
+import sys
+
+import algorithms
+
+HEAVY = ('bitstring', 'numpy')
+# Modules that are built on a heavy dependency, rather than using it
+# for an optional extra
+NEEDS_HEAVY = {'bums_numpy': {'numpy'}}
+
+# Run in the child interpreter; its report is the last line it writes
+_PROBE = """
+import sys, time
+start = time.perf_counter()
+import algorithms.{module}
+seconds = time.perf_counter() - start
+import json
+print(json.dumps({{'seconds': seconds,
+                  'heavy': [m for m in {heavy!r} if m in sys.modules]}}))
+"""
+
+
+def measure(module, repeat):
+    """Import algorithms.module in repeat fresh interpreters and return
+    its result dictionary."""
+    result = {'module': module}
+    root = os.path.dirname(os.path.dirname(os.path.abspath(algorithms.__file__)))
+    best = None
+    for _ in range(repeat):
+        child = subprocess.run(
+            [sys.executable, '-c', _PROBE.format(module=module, heavy=HEAVY)],
+            cwd=root, capture_output=True, text=True)
+        if child.returncode != 0:
+            result['error'] = child.stderr.strip().splitlines()[-1]
+            return result
+        *output, report = child.stdout.splitlines()
+        report = json.loads(report)
+        if best is None or report['seconds'] < best['seconds']:
+            best = report
+        if output or child.stderr:
+            result['output'] = '\n'.join(output + child.stderr.splitlines())
+    result['seconds'] = best['seconds']
+    result['heavy'] = best['heavy']
+    return result
+
+
+def problems(result):
+    """Return a list of what is wrong with a result from measure."""
+    found = []
+    if 'error' in result:
+        found.append(f"fails to import: {result['error']}")
+    if 'output' in result:
+        found.append(f"writes output when imported: {result['output']!r}")
+    unexpected = set(result.get('heavy', ())) - NEEDS_HEAVY.get(result['module'], set())
+    if unexpected:
+        found.append(f"imports {', '.join(sorted(unexpected))}")
+    return found
+
+
+def main():
+    modules = [m.name for m in pkgutil.iter_modules(algorithms.__path__)]
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('-m', nargs='+', choices=modules, default=modules,
+                        help='modules of the package to import')
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--json', action='store_true',
+                        help='write the results as JSON')
+    args = parser.parse_args()
+
+    results = [measure(module, args.repeat) for module in args.m]
+    if args.json:
+        json.dump(results, sys.stdout, indent=2)
+        sys.stdout.write('\n')
+    else:
+        print(f"{'module':<20} {'ms':>8}  heavy imports")
+        for r in results:
+            ms = f"{1e3 * r['seconds']:8.2f}" if 'seconds' in r else f"{'-':>8}"
+            print(f"{r['module']:<20} {ms}  {', '.join(r.get('heavy', [])) or '-'}")
+
+    failed = False
+    for r in results:
+        for problem in problems(r):
+            print(f"algorithms.{r['module']}: {problem}", file=sys.stderr)
+            failed = True
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,74 @@
+import argparse
+import random
+
+from algorithms import check_dag
+from algorithms.incremental_dag import CycleError, IncrementalDAG
+from benchmarks.generators import timed
+
+
+# Insert a stream of random edges into a DAG one at a time, keeping
+# each edge only if the graph stays acyclic, and time IncrementalDAG
+# against adding the edge and rechecking the whole graph with isDag.
+
+
+def edge_stream(n, m, seed):
+    # m random edges over n vertices, mostly going "forward" (from a
+    # lower to a higher number) so the DAG grows dense before most
+    # insertions are rejected
+    rng = random.Random(seed)
+    edges = []
+    for _ in range(m):
+        u, v = rng.sample(range(n), 2)
+        if rng.random() < 0.9 and u > v:
+            u, v = v, u
+        edges.append((u, v))
+    return edges
+
+def run_incremental(n, edges):
+    dag = IncrementalDAG({v: set() for v in range(n)})
+    accepted = []
+    for u, v in edges:
+        try:
+            dag.add_edge(u, v)
+            accepted.append(True)
+        except CycleError:
+            accepted.append(False)
+    return accepted
+
+def run_recheck(n, edges):
+    g = {v: set() for v in range(n)}
+    accepted = []
+    for u, v in edges:
+        new = v not in g[u]
+        g[u].add(v)
+        if check_dag.isDag(g):
+            accepted.append(True)
+        else:
+            if new:
+                g[u].discard(v)
+            accepted.append(False)
+    return accepted
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='IncrementalDAG against a full isDag recheck per insert')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[100, 300, 1000],
+                        help='numbers of vertices')
+    parser.add_argument('--edges', type=int, default=5,
+                        help='edges inserted per vertex')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    print(f"{'n':>6} {'inserts':>8} {'accepted':>8} {'incremental':>12} "
+          f"{'recheck':>10} {'speedup':>8}")
+    for n in args.sizes:
+        edges = edge_stream(n, args.edges * n, args.seed)
+        fast, t_fast = timed(run_incremental, n, edges)
+        slow, t_slow = timed(run_recheck, n, edges)
+        assert fast == slow, "incremental and full checks disagree"
+        print(f"{n:>6} {len(edges):>8} {sum(fast):>8} {t_fast:>11.3f}s "
+              f"{t_slow:>9.3f}s {t_slow / t_fast:>7.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# bench_inplace.py
+
+"""Time/memory trade-off of bums_inplace.InPlaceSorter: sort the same
+random array with scratch space ranging from n//2 cells (what
+bums.Sorter uses) down to none, and report the time taken and the
+peak memory allocated by the sorter, as measured by tracemalloc.
+
+Usage: python3 -m benchmarks.bench_inplace [-n SIZE] [--seed S]
+"""
+
+import argparse
+import math
+import random
+import time
+import tracemalloc
+
+from algorithms import bums_inplace
+from benchmarks.generators import to_fsa
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('-n', type=int, default=100_000, help='array size')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    n = args.n
+    rng = random.Random(args.seed)
+    values = [rng.random() for _ in range(n)]
+    sizes = {'n//2': n // 2, 'n//8': n // 8, 'n//64': n // 64,
+             'sqrt(n)': math.isqrt(n), '16': 16, '0': 0}
+
+    print(f"n = {n}")
+    print(f"{'scratch':>8} {'cells':>9} {'peak KiB':>9} {'time':>10}")
+    for label, size in sizes.items():
+        a = to_fsa(values)
+        tracemalloc.start()
+        bums_inplace.InPlaceSorter(a, size).sort()
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+        a = to_fsa(values)
+        sorter = bums_inplace.InPlaceSorter(a, size)
+        start = time.perf_counter()
+        sorter.sort()
+        seconds = time.perf_counter() - start
+        assert [a[i] for i in range(n)] == sorted(values)
+        print(f"{label:>8} {size:>9} {peak / 1024:9.1f} {seconds:9.3f}s")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# bench_parallel.py
+
+"""Scaling benchmark for bums_parallel.ParallelSorter: sort the same
+random array with 1, 2, ... N workers and report the time and the
+speedup over one worker. The sequential bums.Sorter is timed too, as
+a reference.
+
+Usage: python3 -m benchmarks.bench_parallel [-n SIZE] [-w MAXWORKERS] [-r REPEATS]
+"""
+
+import argparse
+import os
+import random
+import time
+
+from algorithms import bums, bums_parallel
+from benchmarks.generators import to_fsa
+
+
+def timeSort(makeSorter, values, repeats):
+    """Return the best time, over the given number of runs, taken by
+    makeSorter(array).sort() on a fresh copy of values."""
+    best = float('inf')
+    for _ in range(repeats):
+        a = to_fsa(values)
+        sorter = makeSorter(a)
+        start = time.perf_counter()
+        sorter.sort()
+        best = min(best, time.perf_counter() - start)
+        assert [a[i] for i in range(len(a))] == sorted(values)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('-n', type=int, default=200_000, help='array size')
+    parser.add_argument('-w', type=int, default=os.cpu_count() or 1,
+                        help='maximum number of workers')
+    parser.add_argument('-r', type=int, default=3, help='repeats per point')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    random.seed(args.seed)
+    values = [random.random() for _ in range(args.n)]
+
+    print(f"n = {args.n}")
+    sequential = timeSort(bums.Sorter, values, args.r)
+    print(f"{'sequential':>10} {sequential:10.3f}s")
+    print(f"{'workers':>10} {'time':>11} {'speedup':>8}")
+    base = None
+    for w in range(1, args.w + 1):
+        t = timeSort(lambda a: bums_parallel.ParallelSorter(a, workers=w),
+                     values, args.r)
+        base = base or t
+        print(f"{w:>10} {t:10.3f}s {base / t:8.2f}")
+
+
+if __name__ == '__main__':
+    main()
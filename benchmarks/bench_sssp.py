@@ -0,0 +1,62 @@
+import argparse
+import random
+
+from algorithms.bf_cycle import bf
+from algorithms.sssp import dial, dijkstra, shortest_distances
+from benchmarks.generators import timed
+
+# Two sweeps over random graphs with non-negative integer weights and
+# 4 edges per vertex: Bellman-Ford against Dijkstra as the graph grows,
+# and the binary heap against the bucket queue as the largest weight
+# grows (which is where BUCKET_LIMIT comes from).
+
+
+def random_graph(n, max_weight, seed, degree=4):
+    rng = random.Random(seed)
+    g = {v: {} for v in range(n)}
+    for u in range(n):
+        for _ in range(degree):
+            g[u][rng.randrange(n)] = rng.randint(0, max_weight)
+    return g
+
+def run_heap(g, s):
+    return dijkstra({v: float('inf') for v in g}, lambda u: g[u].items(), s)
+
+def run_buckets(g, s, max_weight):
+    return dial({v: float('inf') for v in g}, lambda u: g[u].items(), s, max_weight)
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Crossovers between the shortest-path algorithms')
+    parser.add_argument('--sizes', type=int, nargs='+',
+                        default=[10, 30, 100, 300, 1000, 3000])
+    parser.add_argument('--weights', type=int, nargs='+',
+                        default=[1, 16, 256, 4096, 1 << 14, 1 << 16, 1 << 18])
+    parser.add_argument('-n', type=int, default=20000,
+                        help='vertices for the weight sweep')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    print(f"{'n':>6} {'bf':>10} {'heap':>10} {'buckets':>10} {'auto':>10}")
+    for n in args.sizes:
+        g = random_graph(n, 10, args.seed)
+        (expected, _), t_bf = timed(bf, g, 0)
+        dist_heap, t_heap = timed(run_heap, g, 0)
+        dist_buckets, t_buckets = timed(run_buckets, g, 0, 10)
+        (dist_auto, _), t_auto = timed(shortest_distances, g, 0)
+        assert expected == dist_heap == dist_buckets == dist_auto
+        print(f"{n:>6} {1e3 * t_bf:>8.3f}ms {1e3 * t_heap:>8.3f}ms "
+              f"{1e3 * t_buckets:>8.3f}ms {1e3 * t_auto:>8.3f}ms")
+
+    print()
+    print(f"{'max w':>6} {'heap':>10} {'buckets':>10}")
+    for w in args.weights:
+        g = random_graph(args.n, w, args.seed)
+        dist_heap, t_heap = timed(run_heap, g, 0)
+        dist_buckets, t_buckets = timed(run_buckets, g, 0, w)
+        assert dist_heap == dist_buckets
+        print(f"{w:>6} {1e3 * t_heap:>8.3f}ms {1e3 * t_buckets:>8.3f}ms")
+
+
+if __name__ == '__main__':
+    main()
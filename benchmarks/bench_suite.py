@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# bench_suite.py
+
+"""Benchmark every algorithm in the repository on synthetic inputs.
+
+Benchmarks: huffman-encode and huffman-decode (HuffmanCode), sort
+(bums.Sorter), maxflow (compute_max_flow), bf, bf_numpy (on a
+CSRGraph), shortest_paths and isDag (check_dag), all from the
+algorithms package. Each one is run on every applicable input kind
+from generators.py (random, skewed, grid, layered) at every requested
+size, and timed as the best of --repeat runs; generating and
+converting the input is not timed.
+
+Sizes default to 10^3..10^5 and go up to 10^7, but every benchmark
+has a size limit past which pure Python takes too long (bf is
+O(V*E), and compute_max_flow runs a BFS of the residual graph for
+every augmenting path); bigger points are skipped unless --no-limits
+is given. shortest_paths stops after the first PATH_LIMIT paths, since a
+grid has exponentially many between opposite corners, and isDag runs
+on DAGs, so that it always has to visit the whole graph.
+
+Results are written as JSON. With --baseline, they are compared with
+an earlier run and every point that got more than --tolerance slower
+is reported, and the script exits with status 1.
+
+Usage: python3 -m benchmarks.bench_suite [-b sort bf ...] [-i random grid ...]
+           [-n 1000 10000 ...] [--repeat R] [--seed S] [--no-limits]
+           [-o FILE] [--baseline FILE] [--tolerance T]
+"""
+
+import argparse
+import json
+import platform
+import random
+import sys
+import time
+
+from algorithms import bums, check_dag
+from algorithms.bf_cycle import bf, bf_numpy
+from algorithms.bfs_all import iter_shortest_paths
+from algorithms.huffman import HuffmanCode
+from algorithms.csr import CSRGraph
+from algorithms.maxflow import compute_max_flow
+from benchmarks import generators
+
+PATH_LIMIT = 1000
+
+
+# Each setup function takes (kind, n, rng) and returns a function that
+# makes a fresh zero-argument run function for every timed repetition.
+
+def setup_huffman_encode(kind, n, rng):
+    data = generators.BYTES[kind](n, rng)
+    code = HuffmanCode(HuffmanCode.occurrences2frequencies(
+        HuffmanCode.makeOccurrencesTable(data)))
+    return lambda: lambda: code.encode(data)
+
+
+def setup_huffman_decode(kind, n, rng):
+    data = generators.BYTES[kind](n, rng)
+    code = HuffmanCode(HuffmanCode.occurrences2frequencies(
+        HuffmanCode.makeOccurrencesTable(data)))
+    bits = code.encode(data)
+    return lambda: lambda: code.decode(bits)
+
+
+def setup_sort(kind, n, rng):
+    values = generators.VALUES[kind](n, rng)
+    def fresh():
+        # Sorting is in place, so every run gets its own array
+        return bums.Sorter(generators.to_fsa(values)).sort
+    return fresh
+
+
+def setup_maxflow(kind, n, rng):
+    n, edges = generators.graph_edges(kind, n, rng)
+    capacity = generators.to_capacities(edges)
+    return lambda: lambda: compute_max_flow(capacity, '0', str(n - 1))
+
+
+def setup_bf(kind, n, rng):
+    n, edges = generators.graph_edges(kind, n, rng)
+    g = generators.to_weighted(n, edges)
+    return lambda: lambda: bf(g, 0)
+
+
+def setup_bf_numpy(kind, n, rng):
+    n, edges = generators.graph_edges(kind, n, rng)
+    g = CSRGraph.from_weighted(generators.to_weighted(n, edges))
+    return lambda: lambda: bf_numpy(g, 0)
+
+
+def setup_shortest_paths(kind, n, rng):
+    n, edges = generators.graph_edges(kind, n, rng)
+    g = generators.to_adjacency(n, edges)
+    return lambda: lambda: list(iter_shortest_paths(g, 0, n - 1, limit=PATH_LIMIT))
+
+
+def setup_is_dag(kind, n, rng):
+    n, edges = generators.graph_edges(kind, n, rng, acyclic=True)
+    g = generators.to_adjacency(n, edges)
+    return lambda: lambda: check_dag.isDag(g)
+
+
+# name -> (setup, input kinds, size limit)
+BENCHMARKS = {
+    'huffman-encode': (setup_huffman_encode, generators.BYTES, 10 ** 4),
+    'huffman-decode': (setup_huffman_decode, generators.BYTES, 10 ** 4),
+    'sort': (setup_sort, generators.VALUES, 10 ** 6),
+    'maxflow': (setup_maxflow, generators.GRAPHS, 10 ** 4),
+    'bf': (setup_bf, generators.GRAPHS, 10 ** 4),
+    'bf_numpy': (setup_bf_numpy, generators.GRAPHS, 10 ** 6),
+    'shortest_paths': (setup_shortest_paths, generators.GRAPHS, 10 ** 6),
+    'isDag': (setup_is_dag, generators.GRAPHS, 10 ** 7),
+}
+
+
+def measure(name, kind, n, repeat, seed):
+    """Return the result dictionary for one benchmark point: the best
+    time of repeat runs, or the error that stopped it."""
+    result = {'benchmark': name, 'input': kind, 'n': n}
+    setup = BENCHMARKS[name][0]
+    try:
+        fresh = setup(kind, n, random.Random(seed))
+        times = []
+        for _ in range(repeat):
+            run = fresh()
+            start = time.perf_counter()
+            run()
+            times.append(time.perf_counter() - start)
+    except Exception as e:
+        result['error'] = f"{type(e).__name__}: {e}"
+    else:
+        result['seconds'] = min(times)
+        result['repeat'] = repeat
+    return result
+
+
+def regressions(results, baseline, tolerance):
+    """Return a list of messages, one for each point of results that is
+    more than tolerance (a fraction) slower than in baseline."""
+    old = {(r['benchmark'], r['input'], r['n']): r for r in baseline['results']}
+    messages = []
+    for r in results:
+        b = old.get((r['benchmark'], r['input'], r['n']))
+        if b is None or 'seconds' not in b:
+            continue
+        if 'seconds' not in r:
+            messages.append(f"{r['benchmark']} {r['input']} n={r['n']}: "
+                            f"now fails ({r['error']})")
+        elif r['seconds'] > b['seconds'] * (1 + tolerance):
+            messages.append(f"{r['benchmark']} {r['input']} n={r['n']}: "
+                            f"{b['seconds']:.6f}s -> {r['seconds']:.6f}s "
+                            f"({r['seconds'] / b['seconds'] - 1:+.0%})")
+    return messages
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('-b', nargs='+', choices=BENCHMARKS,
+                        default=list(BENCHMARKS), help='benchmarks')
+    parser.add_argument('-i', nargs='+', choices=generators.GRAPHS,
+                        default=list(generators.GRAPHS), help='input kinds')
+    parser.add_argument('-n', type=int, nargs='+',
+                        default=[1000, 10_000, 100_000], help='input sizes')
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--no-limits', action='store_true',
+                        help='run sizes past each benchmark\'s limit too')
+    parser.add_argument('-o', help='output file (default: stdout)')
+    parser.add_argument('--baseline', help='JSON results to compare against')
+    parser.add_argument('--tolerance', type=float, default=0.25,
+                        help='slowdown to tolerate, as a fraction')
+    args = parser.parse_args()
+
+    results = []
+    for name in args.b:
+        _, kinds, limit = BENCHMARKS[name]
+        for kind in args.i:
+            if kind not in kinds:
+                continue
+            for n in args.n:
+                if n > limit and not args.no_limits:
+                    print(f"skipping {name} {kind} n={n} (limit {limit})",
+                          file=sys.stderr)
+                    continue
+                result = measure(name, kind, n, args.repeat, args.seed)
+                results.append(result)
+                print(f"{name} {kind} n={n}: "
+                      f"{result.get('seconds', result.get('error'))}", file=sys.stderr)
+
+    report = {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'seed': args.seed,
+        'results': results,
+    }
+    out = open(args.o, 'w') if args.o else sys.stdout
+    try:
+        json.dump(report, out, indent=2)
+        out.write('\n')
+    finally:
+        if args.o:
+            out.close()
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            messages = regressions(results, json.load(f), args.tolerance)
+        for message in messages:
+            print('REGRESSION', message, file=sys.stderr)
+        if messages:
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# generators.py
+
+"""Seeded synthetic inputs for the benchmark suite.
+
+Every generator takes a size n and a random.Random, so the same seed
+always gives the same input. Graphs are generated as lists of
+(u, v, weight) edges over the vertices 0..n-1 and converted to
+whichever format an algorithm takes:
+
+random    every vertex has `degree` edges to uniformly random vertices.
+skewed    like random, but targets are drawn from a Zipf-like
+          distribution, so a few hub vertices get most of the edges.
+grid      a square grid (n rounded down to a square) with edges right
+          and down; a DAG with exponentially many shortest paths
+          between opposite corners.
+layered   sqrt(n) layers of sqrt(n) vertices, each vertex with edges
+          to `degree` random vertices of the next layer; a DAG, and
+          the usual shape of a flow network.
+
+With acyclic=True, random and skewed edges are all oriented from the
+lower to the higher vertex number, so the graph is a DAG.
+
+Sequences (for sorting and compression) come in random and skewed
+kinds too; to_fsa puts one in the fixed-size array the sorters take.
+
+timed(f, *args) runs f once and returns its result and the seconds it
+took, for the benchmarks that time single runs.
+"""
+
+import bisect
+import itertools
+import math
+import time
+
+from algorithms import fsa
+
+MAX_WEIGHT = 100
+
+
+def random_edges(n, rng, degree=4, acyclic=False):
+    return _orient([(u, rng.randrange(n), rng.randint(1, MAX_WEIGHT))
+                    for u in range(n) for _ in range(degree)], acyclic)
+
+
+def skewed_edges(n, rng, degree=4, acyclic=False):
+    # Vertex i is picked with probability proportional to 1/(i+1), in a
+    # shuffled order so the hubs are not all at low numbers
+    cumulative = list(itertools.accumulate(1 / (i + 1) for i in range(n)))
+    hubs = list(range(n))
+    rng.shuffle(hubs)
+    def pick():
+        return hubs[min(n - 1, bisect.bisect(cumulative, rng.random() * cumulative[-1]))]
+    return _orient([(u, pick(), rng.randint(1, MAX_WEIGHT))
+                    for u in range(n) for _ in range(degree)], acyclic)
+
+
+def grid_edges(n, rng, degree=None, acyclic=True):
+    side = max(1, math.isqrt(n))
+    edges = []
+    for r in range(side):
+        for c in range(side):
+            u = r * side + c
+            if c + 1 < side:
+                edges.append((u, u + 1, rng.randint(1, MAX_WEIGHT)))
+            if r + 1 < side:
+                edges.append((u, u + side, rng.randint(1, MAX_WEIGHT)))
+    return edges
+
+
+def layered_edges(n, rng, degree=4, acyclic=True):
+    width = max(1, math.isqrt(n))
+    layers = max(1, n // width)
+    edges = []
+    for layer in range(layers - 1):
+        for u in range(layer * width, (layer + 1) * width):
+            for _ in range(degree):
+                v = (layer + 1) * width + rng.randrange(width)
+                edges.append((u, v, rng.randint(1, MAX_WEIGHT)))
+    return edges
+
+
+def _orient(edges, acyclic):
+    if not acyclic:
+        return edges
+    return [(min(u, v), max(u, v), w) for u, v, w in edges if u != v]
+
+
+GRAPHS = {
+    'random': random_edges,
+    'skewed': skewed_edges,
+    'grid': grid_edges,
+    'layered': layered_edges,
+}
+
+
+def graph_edges(kind, n, rng, acyclic=False):
+    """Return (vertices, edges) for a graph of the given kind: the
+    number of vertices actually used and the (u, v, weight) edges."""
+    edges = GRAPHS[kind](n, rng, acyclic=acyclic)
+    if kind == 'grid':
+        n = max(1, math.isqrt(n)) ** 2
+    elif kind == 'layered':
+        width = max(1, math.isqrt(n))
+        n = width * max(1, n // width)
+    return n, edges
+
+
+def to_weighted(n, edges):
+    # bf's format: every vertex maps to a dict {neighbour: weight}
+    g = {v: {} for v in range(n)}
+    for u, v, w in edges:
+        g[u][v] = w
+    return g
+
+
+def to_adjacency(n, edges):
+    # shortest_paths' and isDag's format: every vertex maps to a set
+    g = {v: set() for v in range(n)}
+    for u, v, _ in edges:
+        g[u].add(v)
+    return g
+
+
+def to_capacities(edges):
+    # compute_max_flow's format, with string labels like the CSV files.
+    # Antiparallel edges and self-loops are kept, as compute_max_flow
+    # handles both; of repeated edges the last one is kept, as in
+    # to_weighted
+    return {(str(u), str(v)): w for u, v, w in edges}
+
+
+def to_fsa(values):
+    # The sorters' format: an fsa array holding the values
+    a = fsa.FixedSizeArray(len(values))
+    for i, v in enumerate(values):
+        a[i] = v
+    return a
+
+
+def random_values(n, rng):
+    return [rng.random() for _ in range(n)]
+
+
+def skewed_values(n, rng):
+    # Zipf-like: small values are much more common than large ones
+    return [int(rng.paretovariate(1.2)) for _ in range(n)]
+
+
+def random_bytes(n, rng):
+    return bytes(rng.randrange(256) for _ in range(n))
+
+
+def skewed_bytes(n, rng):
+    # English-like letter frequencies, roughly
+    return bytes(min(255, 97 + int(rng.expovariate(0.25))) for _ in range(n))
+
+
+VALUES = {'random': random_values, 'skewed': skewed_values}
+BYTES = {'random': random_bytes, 'skewed': skewed_bytes}
+
+
+def timed(f, *args):
+    start = time.perf_counter()
+    result = f(*args)
+    return result, time.perf_counter() - start
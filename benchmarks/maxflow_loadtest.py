@@ -0,0 +1,100 @@
+import argparse
+import asyncio
+import json
+import random
+import statistics
+import time
+
+# Load test for algorithms.maxflow_service: load a network into a running
+# service, fire max flow queries at it from several concurrent
+# connections, and report the latency percentiles and throughput.
+# Queries are drawn from a fixed pool of (s, t) pairs, so once the
+# pool has been asked once the service answers from its cache; use a
+# big --pairs to measure mostly uncached queries.
+
+
+class Connection:
+    # One client connection; requests are matched to responses by id
+    def __init__(self, reader, writer):
+        self.reader = reader
+        self.writer = writer
+        self.next_id = 0
+        self.pending = {}
+        self.listener = asyncio.create_task(self.listen())
+
+    async def listen(self):
+        while line := await self.reader.readline():
+            response = json.loads(line)
+            self.pending.pop(response['id']).set_result(response)
+
+    async def request(self, **request):
+        self.next_id += 1
+        request['id'] = self.next_id
+        future = self.pending[self.next_id] = asyncio.get_running_loop().create_future()
+        self.writer.write((json.dumps(request) + '\n').encode())
+        await self.writer.drain()
+        return await future
+
+    async def close(self):
+        self.writer.close()
+        self.listener.cancel()
+
+
+async def worker(socket, queries, latencies, failures):
+    connection = Connection(*await asyncio.open_unix_connection(socket, limit=1 << 24))
+    try:
+        while queries:
+            s, t = queries.pop()
+            start = time.perf_counter()
+            response = await connection.request(op='maxflow', name='loadtest', s=s, t=t)
+            latencies.append(time.perf_counter() - start)
+            if not response['ok']:
+                failures.append(response['error'])
+    finally:
+        await connection.close()
+
+async def main():
+    parser = argparse.ArgumentParser(description='Load test algorithms.maxflow_service')
+    parser.add_argument('--socket', required=True, help="the service's Unix socket")
+    parser.add_argument('--network', default='Max Flow Tick/flownetwork_07.csv',
+                        help='network for the service to load')
+    parser.add_argument('--requests', type=int, default=1000)
+    parser.add_argument('--concurrency', type=int, default=16)
+    parser.add_argument('--pairs', type=int, default=50,
+                        help='distinct (s, t) pairs to draw queries from')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    setup = Connection(*await asyncio.open_unix_connection(args.socket))
+    loaded = await setup.request(op='load', name='loadtest', path=args.network)
+    if not loaded['ok']:
+        raise SystemExit(loaded['error'])
+    print(f"loaded {args.network}: {loaded['vertices']} vertices, "
+          f"{loaded['edges']} edges (version {loaded['version']})")
+
+    # Vertex labels, from the network file itself
+    with open(args.network) as f:
+        next(f)
+        vertices = sorted({v for line in f for v in line.split(',')[:2]})
+    rng = random.Random(args.seed)
+    pairs = [tuple(rng.sample(vertices, 2)) for _ in range(args.pairs)]
+    queries = [rng.choice(pairs) for _ in range(args.requests)]
+
+    latencies, failures = [], []
+    start = time.perf_counter()
+    await asyncio.gather(*(worker(args.socket, queries, latencies, failures)
+                           for _ in range(args.concurrency)))
+    elapsed = time.perf_counter() - start
+    stats = await setup.request(op='stats')
+    await setup.close()
+
+    percentiles = statistics.quantiles(latencies, n=100)
+    print(f"{len(latencies)} requests in {elapsed:.2f}s "
+          f"({len(latencies) / elapsed:.0f}/s), {len(failures)} failed")
+    print(f"latency p50 {1e3 * percentiles[49]:.2f}ms  "
+          f"p99 {1e3 * percentiles[98]:.2f}ms  max {1e3 * max(latencies):.2f}ms")
+    print(f"service cache: {stats['hits']} hits, {stats['misses']} misses")
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
@@ -0,0 +1,108 @@
+import math
+import random
+
+import pytest
+
+from algorithms.bf_cycle import bf, spfa
+from algorithms.csr import CSRGraph
+
+
+def _graph(seed):
+    rng = random.Random(seed)
+    n = rng.randint(1, 6)
+    return {u: {rng.randrange(n): rng.randint(-3, 6)
+                for _ in range(rng.randint(0, 3))}
+            for u in range(n)}
+
+
+def _reachable(g, sources):
+    reached = set(sources)
+    stack = list(sources)
+    while stack:
+        for v in g[stack.pop()]:
+            if v not in reached:
+                reached.add(v)
+                stack.append(v)
+    return reached
+
+
+def _brute_force(g, s):
+    # (shortest simple-path distances from s, vertices on a negative
+    # cycle reachable from s), by trying every simple path and cycle
+    dist = {v: math.inf for v in g}
+    on_negative_cycle = set()
+    def walk(path, length, start):
+        u = path[-1]
+        for v, c in g[u].items():
+            if v == start:
+                if length + c < 0:
+                    on_negative_cycle.update(path)
+            elif v not in path:
+                walk(path + [v], length + c, start)
+    def paths(path, length):
+        u = path[-1]
+        dist[u] = min(dist[u], length)
+        for v, c in g[u].items():
+            if v not in path:
+                paths(path + [v], length + c)
+    paths([s], 0)
+    for v in _reachable(g, [s]):
+        walk([v], 0, v)
+    return dist, on_negative_cycle
+
+
+def _check_cycle(g, cycle, s):
+    assert cycle
+    weight = sum(g[u][v] for u, v in zip(cycle, cycle[1:] + cycle[:1]))
+    assert weight < 0
+    assert set(cycle) <= _reachable(g, [s])
+
+
+@pytest.mark.parametrize('csr', [False, True])
+@pytest.mark.parametrize('seed', range(300))
+def test_against_brute_force(seed, csr):
+    g = _graph(seed)
+    dist, on_negative_cycle = _brute_force(g, 0)
+    h = CSRGraph.from_weighted(g) if csr else g
+
+    distances, cycle = bf(h, 0)
+    if on_negative_cycle:
+        assert distances is None
+        _check_cycle(g, cycle, 0)
+    else:
+        assert cycle is None
+        assert distances == dist
+
+    distances, cycle = bf(h, 0, unbounded=True)
+    unbounded = _reachable(g, on_negative_cycle)
+    assert distances == {v: -math.inf if v in unbounded else dist[v] for v in g}
+    if on_negative_cycle:
+        _check_cycle(g, cycle, 0)
+    else:
+        assert cycle is None
+
+
+@pytest.mark.parametrize('seed', range(300))
+def test_spfa_agrees_with_bf(seed):
+    g = _graph(seed)
+    distances, cycle = spfa(g, 0)
+    expected, expected_cycle = bf(g, 0)
+    if expected_cycle is None:
+        assert (distances, cycle) == (expected, None)
+    else:
+        assert distances is None
+        _check_cycle(g, cycle, 0)
+
+
+def test_bf_numpy_agrees_with_bf():
+    pytest.importorskip('numpy')
+    from algorithms.bf_cycle import bf_numpy
+    for seed in range(100):
+        g = _graph(seed)
+        distances, cycle = bf_numpy(g, 0, unbounded=True)
+        expected, expected_cycle = bf(g, 0, unbounded=True)
+        assert distances == expected
+        if expected_cycle is None:
+            assert cycle is None
+        else:
+            _check_cycle(g, cycle, 0)
@@ -0,0 +1,68 @@
+import multiprocessing
+import random
+
+import pytest
+
+from algorithms import bfs_all, csr_file
+from algorithms.csr import CSRGraph
+
+
+def _graph(seed, n=12):
+    rng = random.Random(seed)
+    return {u: {rng.randrange(n) for _ in range(rng.randint(0, 3))}
+            for u in range(n)}
+
+
+def _brute_force(g, s, t):
+    # Every simple path from s to t, keeping the shortest ones (there
+    # are none from a vertex to itself, as in shortest_paths)
+    if s == t:
+        return []
+    paths = []
+    def extend(path):
+        u = path[-1]
+        if u == t:
+            paths.append(path)
+            return
+        for v in g[u]:
+            if v not in path:
+                extend(path + [v])
+    extend([s])
+    shortest = min(map(len, paths), default=0)
+    return sorted(p for p in paths if len(p) == shortest)
+
+
+@pytest.mark.parametrize('seed', range(20))
+def test_shortest_paths(seed):
+    g = _graph(seed)
+    for s in g:
+        for t in g:
+            expected = _brute_force(g, s, t)
+            assert sorted(bfs_all.shortest_paths(g, s, t)) == expected
+            assert bfs_all.count_shortest_paths(g, s, t) == len(expected)
+
+
+def test_batch_matches_single_queries():
+    g = _graph(0, n=40)
+    rng = random.Random(1)
+    queries = [(rng.randrange(40), rng.randrange(40)) for _ in range(60)]
+    expected = [bfs_all.shortest_paths(g, s, t) for s, t in queries]
+    cache = bfs_all.DAGCache(g)
+    assert bfs_all.shortest_paths_batch(g, queries, cache) == expected
+    # Now every source is cached
+    assert bfs_all.shortest_paths_batch(g, queries, cache) == expected
+    assert bfs_all.shortest_paths_batch(g, queries, workers=2) == expected
+
+
+def test_batch_of_a_loaded_graph_under_spawn(tmp_path, monkeypatch):
+    # A loaded graph's arrays are memoryviews, which the spawn start
+    # method (the default on macOS) cannot pickle
+    g = CSRGraph.from_adjacency(_graph(2, n=40))
+    csr_file.save(g, tmp_path / 'g.csr')
+    loaded = csr_file.load(tmp_path / 'g.csr')
+    monkeypatch.setattr(multiprocessing, 'get_context',
+                        lambda method=None, _get=multiprocessing.get_context:
+                        _get(method or 'spawn'))
+    queries = [(s, t) for s in range(0, 40, 7) for t in range(0, 40, 5)]
+    assert bfs_all.shortest_paths_batch(loaded, queries, workers=2) == \
+           bfs_all.shortest_paths_batch(g, queries)
@@ -0,0 +1,35 @@
+import math
+import random
+
+import pytest
+
+from algorithms.bums_inplace import InPlaceSorter
+from tests.test_bums_keys import SIZES, Tagged, makeArray
+
+SCRATCH = {'0': lambda n: 0, '1': lambda n: 1, 'sqrt(n)': math.isqrt,
+           'n//2': lambda n: n // 2}
+
+
+@pytest.mark.parametrize('scratch', SCRATCH)
+@pytest.mark.parametrize('n', SIZES)
+def test_stable_like_sorted(n, scratch):
+    # Few distinct values, so equal items have to keep their order
+    # through rotations as well as buffered merges
+    rng = random.Random(n)
+    items = [Tagged(rng.randrange(max(1, n // 4)), i) for i in range(n)]
+    a = makeArray(items)
+    InPlaceSorter(a, SCRATCH[scratch](n)).sort()
+    assert [a[i].tag for i in range(n)] == \
+           [item.tag for item in sorted(items, key=lambda item: item.value)]
+
+
+@pytest.mark.parametrize('scratch', [0, 1, 3])
+def test_rotate(scratch):
+    for nLeft in range(6):
+        for nRight in range(6):
+            values = list(range(nLeft + nRight))
+            a = makeArray(values)
+            sorter = InPlaceSorter(a, scratch)
+            sorter.rotate(0, nLeft, nLeft + nRight)
+            assert [a[i] for i in range(len(a))] == \
+                   values[nLeft:] + values[:nLeft]
@@ -0,0 +1,71 @@
+import random
+
+import pytest
+
+from algorithms import fsa
+from algorithms.bums_keys import KeySorter
+
+# Every size up to 129, and the sizes around each power of two up to
+# 1025, where the last merge of a pass has a short or empty right chunk
+SIZES = sorted(set(range(130)) | {n for k in range(11)
+                                  for n in (2**k - 1, 2**k, 2**k + 1)})
+
+
+class Tagged:
+    """An item that compares by value only, so that items with equal
+    values can still be told apart by their tag."""
+
+    def __init__(self, value, tag):
+        self.value = value
+        self.tag = tag
+
+    def __lt__(self, other):
+        return self.value < other.value
+
+    def __repr__(self):
+        return f"Tagged({self.value!r}, {self.tag!r})"
+
+
+def makeArray(values):
+    a = fsa.FixedSizeArray(len(values))
+    for i, v in enumerate(values):
+        a[i] = v
+    return a
+
+
+def sortedByKeySorter(items, key, reverse):
+    a = makeArray(items)
+    KeySorter(a, key=key, reverse=reverse).sort()
+    return [a[i] for i in range(len(a))]
+
+
+@pytest.mark.parametrize('reverse', [False, True])
+@pytest.mark.parametrize('key', [None, lambda item: item.value % 3],
+                         ids=['key=None', 'key=value%3'])
+@pytest.mark.parametrize('n', SIZES)
+def test_matches_sorted_with_duplicate_keys(n, key, reverse):
+    # Few distinct values, so almost every item has duplicates; the tags
+    # record the original order, which a stable sort keeps among equals
+    rng = random.Random(n)
+    items = [Tagged(rng.randrange(max(1, n // 4)), i) for i in range(n)]
+    expected = sorted(items, key=key, reverse=reverse)
+    result = sortedByKeySorter(items, key, reverse)
+    assert [item.tag for item in result] == [item.tag for item in expected]
+
+
+@pytest.mark.parametrize('reverse', [False, True])
+def test_all_keys_equal(reverse):
+    items = [Tagged(0, i) for i in range(1025)]
+    result = sortedByKeySorter(items, lambda item: item.value, reverse)
+    assert [item.tag for item in result] == list(range(1025))
+
+
+@pytest.mark.parametrize('keys', [[3, 1, 2] * 200, [0.5, -1.0, 0.5] * 200,
+                                  [2**70, 1, 2**70] * 200])
+def test_compact_and_fallback_key_arrays(keys):
+    # int and float keys go into array.array, ints too big for 64 bits
+    # into an fsa array; all must sort the same way
+    items = list(range(len(keys)))
+    for reverse in (False, True):
+        result = sortedByKeySorter(items, keys.__getitem__, reverse)
+        assert result == sorted(items, key=keys.__getitem__, reverse=reverse)
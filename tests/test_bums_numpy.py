@@ -0,0 +1,69 @@
+import math
+import random
+
+import pytest
+
+np = pytest.importorskip('numpy')
+
+from algorithms import bums_numpy
+from algorithms.bums_numpy import NumpySorter
+from tests.test_bums_keys import SIZES, makeArray
+
+
+@pytest.fixture(params=[(128, 1 << 16), (4, 8)],
+                ids=['defaults', 'ROW_CHUNK=4,BLOCK=8'])
+def block(request, monkeypatch):
+    # Small ROW_CHUNK and BLOCK (which must be at least 2*ROW_CHUNK)
+    # take the block-by-block merge of big chunks down to sizes that can
+    # be tested quickly
+    rowChunk, block = request.param
+    monkeypatch.setattr(bums_numpy, 'ROW_CHUNK', rowChunk)
+    monkeypatch.setattr(bums_numpy, 'BLOCK', block)
+
+
+@pytest.mark.parametrize('dtype', ['int64', 'float64', 'uint8', 'int32'])
+@pytest.mark.parametrize('n', SIZES)
+def test_matches_sorted(n, dtype, block):
+    rng = np.random.default_rng(n)
+    a = (rng.integers(0, 200, n) if dtype != 'float64' else rng.random(n)).astype(dtype)
+    expected = sorted(a.tolist())
+    NumpySorter(a).sort()
+    assert a.tolist() == expected
+
+
+@pytest.mark.parametrize('n', [1000, 4099])
+def test_stable(n, block):
+    # 0.0 and -0.0 compare equal but keep their sign, which shows
+    # whether equal values kept their order, in the row merges of the
+    # small passes and the block merges of the big ones
+    rng = random.Random(n)
+    values = [rng.choice([0.0, -0.0, 1.0, -1.0]) for _ in range(n)]
+    a = np.array(values)
+    NumpySorter(a).sort()
+    assert [math.copysign(1, v) for v in a.tolist()] == \
+           [math.copysign(1, v) for v in sorted(values)]
+
+
+def test_fsa_arrays():
+    rng = random.Random(0)
+    for values in ([rng.randrange(100) for _ in range(300)],
+                   [rng.random() for _ in range(300)]):
+        a = makeArray(values)
+        NumpySorter(a).sort()
+        result = [a[i] for i in range(len(a))]
+        assert result == sorted(values)
+        assert [type(v) for v in result] == [type(v) for v in values]
+
+
+def test_mixed_ints_and_floats():
+    values = [1, 2.5, 0]
+    with pytest.raises(TypeError):
+        NumpySorter(makeArray(values))
+    a = makeArray(values)
+    NumpySorter(a, dtype=float).sort()
+    assert [a[i] for i in range(3)] == [0.0, 1.0, 2.5]
+
+
+def test_rejects_non_numeric():
+    with pytest.raises(TypeError):
+        NumpySorter(np.array(['b', 'a']))
@@ -0,0 +1,54 @@
+import math
+import random
+
+import pytest
+
+from algorithms import bums_parallel
+from algorithms.bums_parallel import ParallelSorter
+from tests.test_bums_keys import makeArray
+
+# Small sizes, and sizes where the segments of the first stage and the
+# parts of a split merge are uneven
+SIZES = [0, 1, 2, 3, 7, 8, 9, 31, 33, 100, 1000, 1025, 4099]
+
+
+def sortedByParallelSorter(values, workers, typecode=None):
+    a = makeArray(values)
+    ParallelSorter(a, workers=workers, typecode=typecode).sort()
+    return [a[i] for i in range(len(a))]
+
+
+@pytest.mark.parametrize('workers', [1, 2, 3, 4])
+@pytest.mark.parametrize('n', SIZES)
+def test_matches_sorted(n, workers):
+    rng = random.Random(n)
+    ints = [rng.randrange(-n, n + 1) for _ in range(n)]
+    assert sortedByParallelSorter(ints, workers) == sorted(ints)
+    floats = [rng.random() for _ in range(n)]
+    assert sortedByParallelSorter(floats, workers) == sorted(floats)
+
+
+@pytest.mark.parametrize('workers', [2, 3])
+def test_stable(workers):
+    # 0.0 and -0.0 compare equal but can be told apart, so the signs
+    # show whether equal values kept their order across the merge path
+    # splits
+    rng = random.Random(0)
+    values = [rng.choice([0.0, -0.0, 1.0, -1.0]) for _ in range(3000)]
+    result = sortedByParallelSorter(values, workers)
+    expected = sorted(values)
+    assert [math.copysign(1, v) for v in result] == \
+           [math.copysign(1, v) for v in expected]
+
+
+def test_small_copy_chunks(monkeypatch):
+    monkeypatch.setattr(bums_parallel, 'COPY_CHUNK', 7)
+    values = list(range(500, 0, -1))
+    assert sortedByParallelSorter(values, 2) == sorted(values)
+
+
+def test_mixed_ints_and_floats():
+    values = [1, 2.5, 0]
+    with pytest.raises(TypeError):
+        ParallelSorter(makeArray(values))
+    assert sortedByParallelSorter(values, 2, typecode='d') == [0.0, 1.0, 2.5]
@@ -0,0 +1,65 @@
+import random
+
+import pytest
+
+from algorithms.check_dag import condensation, isDag, stronglyConnectedComponents
+from algorithms.csr import CSRGraph
+
+
+def _graph(seed):
+    rng = random.Random(seed)
+    n = rng.randint(1, 12)
+    return {u: {rng.randrange(n) for _ in range(rng.randint(0, 3))}
+            for u in range(n)}
+
+
+def _reachable(g, s):
+    seen, stack = {s}, [s]
+    while stack:
+        for v in g[stack.pop()]:
+            if v not in seen:
+                seen.add(v)
+                stack.append(v)
+    return seen
+
+
+@pytest.mark.parametrize('csr', [False, True])
+@pytest.mark.parametrize('seed', range(200))
+def test_components_against_reachability(seed, csr):
+    g = _graph(seed)
+    reach = {v: _reachable(g, v) for v in g}
+    labels, component, count = stronglyConnectedComponents(
+        CSRGraph.from_adjacency(g) if csr else g)
+    c = dict(zip(labels, component))
+    assert sorted(set(component)) == list(range(count))
+    for u in g:
+        for v in g:
+            # Same component exactly when each reaches the other
+            assert (c[u] == c[v]) == (v in reach[u] and u in reach[v])
+        for v in g[u]:
+            # Ids are in topological order of the condensation
+            assert c[u] <= c[v]
+    assert isDag(g) == (count == len(g) and all(u not in g[u] for u in g))
+
+
+@pytest.mark.parametrize('seed', range(200))
+def test_condensation(seed):
+    g = _graph(seed)
+    labels, component, dag = condensation(g)
+    c = dict(zip(labels, component))
+    edges = [(u, int(v)) for u in range(len(dag)) for v in dag.successors(u)]
+    assert len(edges) == len(set(edges))
+    assert set(edges) == {(c[u], c[v]) for u in g for v in g[u] if c[u] != c[v]}
+    assert isDag(dag)
+
+
+def test_deep_graph():
+    # A cycle through 100000 vertices, then a long tail: no recursion
+    n = 100_000
+    g = {v: {(v + 1) % n} for v in range(n)}
+    g[0].add(n)
+    g.update({v: {v + 1} for v in range(n, 2 * n - 1)})
+    g[2 * n - 1] = set()
+    labels, component, count = stronglyConnectedComponents(g)
+    assert count == n + 1
+    assert len(set(component[:n])) == 1
@@ -0,0 +1,43 @@
+import io
+import random
+
+import pytest
+
+from algorithms import csr_file
+from algorithms.csr import CSRGraph
+
+
+def _csv(edges):
+    return io.StringIO('u,v,capacity\n' + ''.join(f'{u},{v},{w}\n' for u, v, w in edges))
+
+
+def _same(a, b):
+    assert a.labels == b.labels
+    assert a.index == b.index
+    assert list(a.offsets) == list(b.offsets)
+    assert list(a.targets) == list(b.targets)
+    assert list(a.weights) == list(b.weights)
+    assert [type(w) for w in a.weights] == [type(w) for w in b.weights]
+
+
+@pytest.mark.parametrize('seed', range(20))
+def test_read_csv_packs_like_from_edges(seed):
+    rng = random.Random(seed)
+    n = rng.randint(1, 20)
+    edges = [(str(rng.randrange(n)), str(rng.randrange(n)), rng.randint(0, 9))
+             for _ in range(rng.randint(0, 60))]
+    if seed % 2:
+        # One float weight turns them all into doubles
+        edges.append(('0', '1', 2.5))
+    _same(csr_file.read_csv(_csv(edges)), CSRGraph.from_edges(edges))
+
+
+def test_read_csv_rejects_bad_weights():
+    with pytest.raises(ValueError):
+        csr_file.read_csv(_csv([('a', 'b', 1), ('a', 'c', 'x')]))
+
+
+def test_save_and_load(tmp_path):
+    g = csr_file.read_csv(_csv([('a', 'b', 3), ('b', 'c', 2), ('c', 'a', 1)]))
+    csr_file.save(g, tmp_path / 'g.csr')
+    _same(csr_file.load(tmp_path / 'g.csr'), g)
@@ -0,0 +1,136 @@
+import contextlib
+import gc
+import importlib.util
+import io
+import os
+import sys
+import tracemalloc
+import weakref
+
+import pytest
+
+# Project.py is a script in a directory with a space in its name, and
+# prints its demo when loaded
+_spec = importlib.util.spec_from_file_location(
+    'Project', os.path.join(os.path.dirname(__file__), '..', 'Supo Work', 'Project.py'))
+Project = importlib.util.module_from_spec(_spec)
+with contextlib.redirect_stdout(io.StringIO()):
+    _spec.loader.exec_module(Project)
+
+
+@pytest.fixture
+def fleet(monkeypatch):
+    fleet = Project.Fleet()
+    monkeypatch.setattr(Project.Bike, 'all_bikes', fleet)
+    return fleet
+
+
+def test_every_subclass_registers(fleet):
+    bikes = [Project.Bike(co='Black', br='Trek', yr=2012),
+             Project.Bicycle(co='Red', br='GIANT', yr=2015, ps=15),
+             Project.Ebike(co='Blue', br='Basis', yr=2018, ps=15, bt=10),
+             Project.Motorbike(co='Silver', br='YAMAHA', yr=2013, fl=40, fe=12)]
+    assert list(fleet) == bikes
+    assert len(fleet) == 4
+
+
+def test_find_and_filter(fleet):
+    a = Project.Bike(co='Red', br='Trek', yr=2012)
+    b = Project.Bike(co='Red', br='GIANT', yr=2012)
+    c = Project.Bicycle(co='Blue', br='Trek', yr=2015, ps=15)
+    assert fleet.find('color', 'Red') == {a, b}
+    assert fleet.find('brand', 'Nope') == set()
+    assert fleet.filter(brand='Trek') == {a, c}
+    assert fleet.filter(brand='Trek', year=2012) == {a}
+    assert fleet.filter(color='Blue', year=2012) == set()
+    assert fleet.filter() == {a, b, c}
+
+
+def test_reindex(fleet):
+    a = Project.Bike(co='Red', br='Trek', yr=2012)
+    a._color = 'Green'
+    fleet.register(a)
+    assert fleet.find('color', 'Red') == set()
+    assert fleet.find('color', 'Green') == {a}
+    a._color = 'Red'
+    fleet.register(a)
+    assert fleet.find('color', 'Red') == {a}
+    assert len(fleet) == 1
+
+
+def test_bikes_are_held_weakly_and_compacted(fleet):
+    bikes = [Project.Bike(co=str(i % 3), br='Trek', yr=2000 + i % 5)
+             for i in range(1000)]
+    survivors = bikes[::7]
+    del bikes
+    gc.collect()
+    assert len(fleet) == len(survivors)
+    assert list(fleet) == survivors
+    assert fleet.find('color', '0') == {b for b in survivors if b._color == '0'}
+    assert fleet.filter(brand='Trek', year=2003) == {b for b in survivors
+                                                     if b._year == 2003}
+    # Compaction has renumbered the survivors' slots from 0
+    assert len(fleet._refs) < 1000
+
+
+def test_bikes_dying_in_a_cycle(fleet):
+    # The collector clears every reference to a garbage cycle before
+    # running any of their callbacks, and the first callbacks compact
+    # the registry under the later ones
+    keep = [Project.Bike(co='Red', br='Trek', yr=2012) for _ in range(5)]
+    bikes = [Project.Bike(co='Blue', br='GIANT', yr=2015) for _ in range(20)]
+    for b in bikes:
+        b.me = b
+    errors = []
+    hook = sys.unraisablehook
+    sys.unraisablehook = errors.append
+    try:
+        del b, bikes
+        gc.collect()
+    finally:
+        sys.unraisablehook = hook
+    assert errors == []
+    assert len(fleet) == 5
+    assert list(fleet) == keep
+    assert fleet.find('color', 'Blue') == set()
+    assert fleet.find('color', 'Red') == set(keep)
+
+
+class _NoRegistry:
+    def register(self, bike):
+        pass
+
+
+class _WeakSetRegistry:
+    # What Fleet replaced: a WeakKeyDictionary of every bike's indexed
+    # values, and a WeakSet of bikes per indexed value
+    def __init__(self):
+        self._keys = weakref.WeakKeyDictionary()
+        self._indexes = {field: {} for field in Project.Fleet.FIELDS}
+
+    def register(self, bike):
+        keys = tuple(getattr(bike, '_' + field) for field in Project.Fleet.FIELDS)
+        self._keys[bike] = keys
+        for field, key in zip(Project.Fleet.FIELDS, keys):
+            self._indexes[field].setdefault(key, weakref.WeakSet()).add(bike)
+
+
+def _allocated(n, registry, monkeypatch):
+    monkeypatch.setattr(Project.Bike, 'all_bikes', registry)
+    gc.collect()
+    tracemalloc.start()
+    bikes = [Project.Bike(co='Red', br='Trek', yr=2000 + i % 20) for i in range(n)]
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del bikes
+    return size
+
+
+def test_per_bike_overhead(monkeypatch):
+    # Measured against a registry of weak sets in the same interpreter,
+    # as absolute sizes vary between Python versions
+    n = 100_000
+    bare = _allocated(n, _NoRegistry(), monkeypatch)
+    fleet = _allocated(n, Project.Fleet(), monkeypatch) - bare
+    weakSets = _allocated(n, _WeakSetRegistry(), monkeypatch) - bare
+    assert fleet < weakSets / 2
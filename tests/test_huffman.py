@@ -0,0 +1,34 @@
+import io
+import random
+
+import pytest
+
+from algorithms import __main__ as cli
+from algorithms.huffman import HuffmanCode
+
+
+def _code(data):
+    return HuffmanCode(HuffmanCode.occurrences2frequencies(
+        HuffmanCode.makeOccurrencesTable(data)))
+
+
+@pytest.mark.parametrize('data', [b'a', b'abracadabra', bytes(range(256)) * 3])
+def test_encode_decode(data):
+    code = _code(data)
+    assert bytes(code.decode(code.encode(data))) == data
+
+
+@pytest.mark.parametrize('n', [0, 1, 1000, 5000])
+def test_compress_round_trip(n):
+    rng = random.Random(n)
+    data = bytes(min(255, 97 + int(rng.expovariate(0.25))) for _ in range(n))
+    compressed = io.BytesIO()
+    cli.compress(io.BytesIO(data), compressed, blockSize=1024)
+    decompressed = io.BytesIO()
+    cli.decompress(io.BytesIO(compressed.getvalue()), decompressed)
+    assert decompressed.getvalue() == data
+
+
+def test_decompress_rejects_other_input():
+    with pytest.raises(ValueError):
+        cli.decompress(io.BytesIO(b'not compressed'), io.BytesIO())
@@ -0,0 +1,115 @@
+import math
+import random
+
+import pytest
+
+from algorithms.huffman import HuffmanCode
+from algorithms.huffman_cache import HuffmanCodeCache, SYMBOLS, codewordLengths
+
+
+def _table(data):
+    return HuffmanCode.occurrences2frequencies(HuffmanCode.makeOccurrencesTable(data))
+
+
+def _text(seed, n=500, rate=0.25):
+    rng = random.Random(seed)
+    return bytes(min(255, 97 + int(rng.expovariate(rate))) for _ in range(n))
+
+
+def _expectedLength(code, table):
+    lengths = codewordLengths(code)
+    return sum(table[s] * lengths[i] for i, s in enumerate(SYMBOLS))
+
+
+def _entropy(table):
+    return -sum(f * math.log2(f) for f in table.values() if f > 0)
+
+
+def test_hits_and_misses():
+    cache = HuffmanCodeCache()
+    table = _table(_text(0))
+    code = cache.get(table)
+    assert cache.get(table) is code
+    # A table differing by less than half a quantisation level
+    nudged = dict(table)
+    nudged[b'a'] += 0.1 / cache.levels
+    assert cache.get(nudged) is code
+    assert (cache.hits, cache.nearHits, cache.misses) == (2, 0, 1)
+    assert cache.get(_table(_text(0, rate=1.0))) is not code
+    assert (cache.misses, len(cache)) == (2, 2)
+
+
+def test_near_hits_pick_the_best_code_within_the_penalty():
+    tables = [_table(_text(seed, rate=rate))
+              for seed in range(4) for rate in (0.2, 0.25, 1.0)]
+    for maxPenalty in (0.0, 0.02, 0.1, 1.0):
+        cache = HuffmanCodeCache(maxPenalty=maxPenalty)
+        for table in tables:
+            key = cache.fingerprint(table)
+            if key in cache._entries:
+                expected, near = cache._entries[key][0], False
+            else:
+                # Brute force: the shortest cached code within the bound
+                bound = (1 + maxPenalty) * _entropy(table)
+                lengths = {e[0]: _expectedLength(e[0], table)
+                           for e in cache._entries.values()}
+                within = [c for c, n in lengths.items() if n <= bound]
+                expected = min(within, key=lengths.get) if within else None
+                near = expected is not None
+            nearHits = cache.nearHits
+            code = cache.get(table)
+            assert cache.nearHits == nearHits + near
+            if expected is None:
+                assert code not in lengths
+            else:
+                assert _expectedLength(code, table) == _expectedLength(expected, table)
+        assert cache.hits + cache.nearHits + cache.misses == len(tables)
+        if maxPenalty == 0.0:
+            assert cache.nearHits == 0
+        if maxPenalty == 1.0:
+            assert cache.nearHits > 0
+    cache = HuffmanCodeCache()
+    for table in tables:
+        cache.get(table)
+    assert cache.nearHits == 0 and cache.misses == len(cache) == len(tables)
+
+
+def test_any_cached_code_round_trips_any_block():
+    code = HuffmanCodeCache().get(_table(b'aaaab'))
+    data = bytes(range(256)) + _text(1)
+    assert bytes(code.decode(code.encode(data))) == data
+
+
+def test_lru_eviction():
+    tables = [_table(_text(0, rate=rate)) for rate in (0.2, 0.5, 1.0)]
+    probe = HuffmanCodeCache()
+    sizes = []
+    for table in tables:
+        before = probe.nbytes
+        probe.get(table)
+        sizes.append(probe.nbytes - before)
+    # Room for any two of the three codes, not all of them
+    cache = HuffmanCodeCache(maxBytes=sum(sizes) - 1)
+    a, b, c = tables
+    codeA = cache.get(a)
+    cache.get(b)
+    assert cache.get(a) is codeA  # b is now the least recently used
+    cache.get(c)
+    assert cache.nbytes == sizes[0] + sizes[2] <= cache.maxBytes
+    assert cache.nbytes == sum(size for _, _, size in cache._entries.values())
+    assert list(cache._entries) == [cache.fingerprint(a), cache.fingerprint(c)]
+    assert (cache.hits, cache.misses) == (1, 3)
+
+
+def test_codes_too_big_are_not_cached():
+    cache = HuffmanCodeCache(maxBytes=10)
+    table = _table(_text(0))
+    assert cache.get(table) is not cache.get(table)
+    assert (len(cache), cache.nbytes, cache.misses) == (0, 0, 2)
+
+
+def test_levels_are_checked():
+    with pytest.raises(ValueError):
+        HuffmanCodeCache(levels=0)
+    with pytest.raises(ValueError):
+        HuffmanCodeCache(levels=1 << 16)
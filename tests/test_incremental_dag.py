@@ -0,0 +1,78 @@
+import random
+
+import pytest
+
+from algorithms.incremental_dag import CycleError, IncrementalDAG
+
+
+def _reaches(edges, x, y):
+    # Whether there is a path from x to y along edges (a set of pairs)
+    seen, stack = {x}, [x]
+    while stack:
+        u = stack.pop()
+        if u == y:
+            return True
+        for a, b in edges:
+            if a == u and b not in seen:
+                seen.add(b)
+                stack.append(b)
+    return False
+
+
+def _check_order(dag, edges):
+    position = {v: i for i, v in enumerate(dag.order())}
+    assert sorted(position) == sorted(dag.ord)
+    for x, y in edges:
+        assert position[x] < position[y]
+
+
+@pytest.mark.parametrize('seed', range(50))
+def test_random_insertions(seed):
+    # Every edge that would close a cycle is rejected with that cycle,
+    # and every accepted one keeps the order topological, however much
+    # reordering it forces
+    rng = random.Random(seed)
+    n = rng.randint(2, 15)
+    dag = IncrementalDAG({v: () for v in range(n)})
+    edges = set()
+    for _ in range(4 * n):
+        x, y = rng.randrange(n), rng.randrange(n)
+        if (x, y) in edges:
+            dag.add_edge(x, y)
+            continue
+        if x == y or _reaches(edges, y, x):
+            with pytest.raises(CycleError) as raised:
+                dag.add_edge(x, y)
+            cycle = raised.value.cycle
+            assert cycle[0] == y and cycle[-1] == x
+            assert all(pair in edges for pair in zip(cycle, cycle[1:]))
+        else:
+            dag.add_edge(x, y)
+            edges.add((x, y))
+        _check_order(dag, edges)
+        if edges and rng.random() < 0.1:
+            x, y = rng.choice(sorted(edges))
+            dag.remove_edge(x, y)
+            edges.discard((x, y))
+            _check_order(dag, edges)
+
+
+def test_reversed_chain():
+    # Each edge goes against the current order, so each one reorders
+    # everything inserted so far
+    dag = IncrementalDAG()
+    for v in range(50):
+        dag.add_vertex(v)
+    for v in range(49, 0, -1):
+        dag.add_edge(v, v - 1)
+    assert dag.order() == list(range(49, -1, -1))
+    with pytest.raises(CycleError) as raised:
+        dag.add_edge(0, 49)
+    assert raised.value.cycle == list(range(49, -1, -1))
+
+
+def test_from_graph():
+    dag = IncrementalDAG({'a': {'b', 'c'}, 'b': {'d'}, 'c': {'d'}, 'd': None})
+    _check_order(dag, {('a', 'b'), ('a', 'c'), ('b', 'd'), ('c', 'd')})
+    with pytest.raises(CycleError):
+        IncrementalDAG({'a': {'b'}, 'b': {'a'}})
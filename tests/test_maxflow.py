@@ -0,0 +1,43 @@
+from algorithms.csr import CSRGraph
+from algorithms.maxflow import compute_max_flow
+
+
+def test_source_not_named_0():
+    capacity = {('a', 'b'): 3, ('b', 'c'): 2}
+    for g in (capacity, CSRGraph.from_capacities(capacity)):
+        flow, flows, min_cut = compute_max_flow(g, 'a', 'c')
+        assert flow == 2
+        assert flows == {('a', 'b'): 2, ('b', 'c'): 2}
+        assert sorted(min_cut) == ['a', 'b']
+
+
+def test_antiparallel_edges():
+    # a -> b -> d and a -> c -> b -> d, with b -> c alongside c -> b
+    capacity = {('a', 'b'): 1, ('a', 'c'): 2, ('c', 'b'): 2, ('b', 'c'): 5,
+                ('b', 'd'): 3}
+    flow, flows, _ = compute_max_flow(capacity, 'a', 'd')
+    assert flow == 3
+    assert flows[('b', 'd')] == 3
+
+
+def test_flow_into_source_is_netted():
+    capacity = {('s', 'a'): 4, ('a', 's'): 4, ('a', 't'): 1}
+    flow, _, _ = compute_max_flow(capacity, 's', 't')
+    assert flow == 1
+
+
+def test_unknown_vertices():
+    capacity = {('a', 'b'): 3}
+    assert compute_max_flow(capacity, 'x', 'b')[0] == 0
+    assert compute_max_flow(capacity, 'a', 'x')[0] == 0
+
+
+def test_flow_network_file():
+    import os
+    from algorithms import csr_file
+    path = os.path.join(os.path.dirname(__file__), '..', 'Max Flow Tick',
+                        'flownetwork_07.csv')
+    g = csr_file.from_csv(path)
+    capacity = {(g.labels[u], g.labels[v]): c for u in range(len(g))
+                for v, c in g.edges(u)}
+    assert compute_max_flow(capacity, '0', '14')[0] == 571
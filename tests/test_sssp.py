@@ -0,0 +1,49 @@
+import random
+
+import pytest
+
+from algorithms.bf_cycle import bf
+from algorithms.csr import CSRGraph
+from algorithms.sssp import shortest_distances
+
+
+def _graph(seed, integral):
+    rng = random.Random(seed)
+    n = 40
+    return {u: {rng.randrange(n): rng.randint(0, 30) if integral
+                else rng.uniform(0, 30) for _ in range(3)}
+            for u in range(n)}
+
+
+@pytest.mark.parametrize('queue', [None, 'heap', 'buckets'])
+@pytest.mark.parametrize('csr', [False, True])
+@pytest.mark.parametrize('seed', range(10))
+def test_same_result_as_bf(seed, csr, queue):
+    g = _graph(seed, integral=True)
+    if csr:
+        g = CSRGraph.from_weighted(g)
+    expected = bf(g, 0)
+    result = shortest_distances(g, 0, queue=queue)
+    assert result == expected
+    # Integer weights give integer distances, whichever queue is used
+    assert [type(d) for d in result[0].values()] == \
+           [type(d) for d in expected[0].values()]
+
+
+@pytest.mark.parametrize('csr', [False, True])
+def test_float_weights(csr):
+    g = _graph(0, integral=False)
+    if csr:
+        g = CSRGraph.from_weighted(g)
+    expected, _ = bf(g, 0)
+    result, _ = shortest_distances(g, 0)
+    assert result.keys() == expected.keys()
+    assert all(result[v] == pytest.approx(expected[v]) for v in expected)
+    with pytest.raises(ValueError):
+        shortest_distances(g, 0, queue='buckets')
+
+
+def test_negative_weights_fall_back_to_bf():
+    g = {'a': {'b': 3, 'c': -2}, 'b': {}, 'c': {'a': -1}}
+    assert shortest_distances(g, 'a') == bf(g, 'a')
+    assert shortest_distances(g, 'a', unbounded=True) == bf(g, 'a', unbounded=True)